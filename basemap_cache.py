@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+BASEMAP_CACHE_BYTES = 128 * 1024 * 1024
+
+
+class BasemapCache:
+    # Least-recently-used store of rendered basemap frames (RGBA arrays),
+    # bounded by the total number of bytes held rather than by entry count.
+    def __init__(self, max_bytes=BASEMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        # A plain membership test; unlike get it counts as neither a hit nor
+        # a miss and leaves the LRU order alone.
+        return key in self.frames
+
+    def get(self, key):
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.frames.move_to_end(key)
+        self.hits += 1
+        return frame
+
+    def put(self, key, frame):
+        if key in self.frames:
+            self.nbytes -= self.frames.pop(key).nbytes
+        if frame.nbytes > self.max_bytes:
+            return
+        self.frames[key] = frame
+        self.nbytes += frame.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.frames.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        self.frames.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.frames),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,266 @@
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from disk_cache import cache_path, file_digest, remove_stale, save_array, source_digest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGE_PATH = os.path.join(ROOT, "etopo.jpg")
+
+# The modules that decide what a basemap frame looks like; a change to any
+# of them must not reuse frames drawn by the old code.
+DRAWING_SOURCES = [
+    os.path.join(ROOT, name)
+    for name in (
+        "map_renderer.py",
+        "feature_cache.py",
+        "geometry_store.py",
+        "image_pyramid.py",
+    )
+]
+
+# A4 landscape.
+FIGSIZE = (11.69, 8.27)
+DPI = 150
+
+# zlib level for PNGs. Encoding is most of the work per map and the etopo
+# relief barely compresses better at the default level 6, so favour speed.
+PNG_COMPRESS_LEVEL = 1
+
+# Items per pool task; large enough that a task is mostly rendering, small
+# enough to keep every core busy until the end.
+CHUNK_SIZE = 16
+
+# Titles per style: the worksheet asks, the answer key names the item.
+TITLES = {
+    "hint": "Locate: {item}",
+    "answer": "{item}",
+}
+
+# Per worker process, set up once by _init_worker.
+_worker = {}
+
+
+def _rivers_digest(rivers):
+    return file_digest(
+        extra=[(name, data["coordinates"]) for name, data in sorted(rivers.items())]
+    )
+
+
+def basemap_path(projection, hard_mode, rivers, figsize=FIGSIZE, dpi=DPI):
+    name = type(projection).__name__
+    prefix = f"{name}-{'hard' if hard_mode else 'easy'}-"
+    digest = file_digest(
+        extra=(
+            source_digest(IMAGE_PATH),
+            *(source_digest(path) for path in DRAWING_SOURCES),
+            projection.srs,
+            projection.bounds,
+            figsize,
+            dpi,
+            _rivers_digest(rivers),
+        )
+    )
+    return cache_path("basemaps", f"{prefix}{digest}.npy"), prefix
+
+
+def _load_logic():
+    from game_logic import GameLogic
+    from geopack import load_data
+
+    return GameLogic(load_data())
+
+
+def _new_renderer(figsize, dpi):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from map_renderer import MapRenderer
+
+    figure = Figure(figsize=figsize, dpi=dpi)
+    return MapRenderer(figure, FigureCanvasAgg(figure), IMAGE_PATH)
+
+
+def _render_basemap(projection_name, hard_mode, figsize, dpi):
+    # Renders one basemap frame into the disk cache, unless it is there.
+    import cartopy.crs as ccrs
+
+    projection = getattr(ccrs, projection_name)()
+    rivers = _load_logic().modes["rivers"].dataset
+    path, prefix = basemap_path(projection, hard_mode, rivers, figsize, dpi)
+    if os.path.exists(path):
+        return projection_name, hard_mode, 0.0
+    start = time.perf_counter()
+    renderer = _new_renderer(figsize, dpi)
+    width, height = renderer.canvas.get_width_height(physical=True)
+    frame = renderer.render_basemap(projection, hard_mode, width, height, dpi, rivers)
+    save_array(path, frame)
+    remove_stale(os.path.dirname(path), prefix, os.path.basename(path))
+    return projection_name, hard_mode, time.perf_counter() - start
+
+
+def _init_worker(figsize, dpi):
+    _worker["logic"] = _load_logic()
+    _worker["renderer"] = _new_renderer(figsize, dpi)
+    _worker["figsize"] = figsize
+
+
+def _render_items(projection_name, hard_mode, mode, items, styles, output, fmt):
+    import cartopy.crs as ccrs
+
+    logic = _worker["logic"]
+    renderer = _worker["renderer"]
+    projection = getattr(ccrs, projection_name)()
+    rivers = logic.modes["rivers"].dataset
+    if logic.game_mode != mode:
+        logic.set_game_mode(mode)
+
+    # The frame comes from the disk cache the first time this process sees
+    # the map, and from the renderer's own BasemapCache after that.
+    width, height = renderer.canvas.get_width_height(physical=True)
+    key = (projection, hard_mode, width, height, renderer.figure.dpi)
+    if key not in renderer.basemaps:
+        path, _ = basemap_path(
+            projection, hard_mode, rivers, _worker["figsize"], renderer.figure.dpi
+        )
+        if os.path.exists(path):
+            renderer.basemaps.put(key, np.load(path))
+    renderer.set_projection(projection, hard_mode, rivers)
+
+    directory = os.path.join(
+        output, mode, projection_name + ("-hard" if hard_mode else "")
+    )
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for item in items:
+        geometry = logic.get_hint_geometry(item)
+        for style in styles:
+            renderer.clear_overlays()
+            if geometry:
+                renderer.show_item(item, geometry, style)
+            renderer.ax.set_title(TITLES[style].format(item=item))
+            path = os.path.join(directory, f"{_slug(item)}-{style}.{fmt}")
+            if fmt == "png":
+                renderer.save(path, pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
+            else:
+                renderer.save(path)
+            written.append(path)
+    return written
+
+
+def _slug(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "item"
+
+
+def render_all(
+    modes,
+    projections,
+    hard_modes,
+    styles,
+    output,
+    fmt="png",
+    figsize=FIGSIZE,
+    dpi=DPI,
+    jobs=None,
+):
+    logic = _load_logic()
+    tasks = []
+    for mode in modes or logic.modes:
+        if mode not in logic.modes:
+            raise ValueError(f"unknown game mode: {mode}")
+        logic.set_game_mode(mode)
+        items = logic.get_question_pool()
+        for projection_name in projections:
+            for hard_mode in hard_modes:
+                for start in range(0, len(items), CHUNK_SIZE):
+                    tasks.append(
+                        (
+                            projection_name,
+                            hard_mode,
+                            mode,
+                            items[start : start + CHUNK_SIZE],
+                            styles,
+                            output,
+                            fmt,
+                        )
+                    )
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Each basemap is rendered once, in parallel, before any item needs
+        # it; the item tasks then only paste it in.
+        basemaps = [
+            pool.submit(_render_basemap, name, hard_mode, figsize, dpi)
+            for name in projections
+            for hard_mode in hard_modes
+        ]
+        for future in as_completed(basemaps):
+            name, hard_mode, elapsed = future.result()
+            state = f"{elapsed:.2f} s" if elapsed else "cached"
+            print(f"basemap {name:<28}{'hard' if hard_mode else 'easy':<6}{state}")
+
+    written = []
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(figsize, dpi)
+    ) as pool:
+        for future in as_completed(pool.submit(_render_items, *task) for task in tasks):
+            written.extend(future.result())
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render a printable map for every item in every game mode."
+    )
+    parser.add_argument("--output", default="maps")
+    parser.add_argument(
+        "--mode", action="append", dest="modes", help="a game mode (default: all)"
+    )
+    parser.add_argument(
+        "--projection",
+        action="append",
+        dest="projections",
+        help="a cartopy.crs class name (default: PlateCarree)",
+    )
+    parser.add_argument(
+        "--hard",
+        action="store_true",
+        help="the hard-mode land/ocean basemap instead of etopo",
+    )
+    parser.add_argument("--style", action="append", dest="styles", choices=list(TITLES))
+    parser.add_argument("--format", default="png", choices=["png", "pdf"])
+    parser.add_argument("--dpi", type=int, default=DPI)
+    parser.add_argument(
+        "--jobs", type=int, help="worker processes (default: all cores)"
+    )
+    args = parser.parse_args()
+
+    import cartopy.crs as ccrs
+
+    projections = args.projections or ["PlateCarree"]
+    for name in projections:
+        if not isinstance(getattr(ccrs, name, None), type):
+            parser.error(f"unknown projection: {name}")
+
+    start = time.perf_counter()
+    try:
+        written = render_all(
+            args.modes,
+            projections,
+            [args.hard],
+            args.styles or list(TITLES),
+            args.output,
+            args.format,
+            dpi=args.dpi,
+            jobs=args.jobs,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"{len(written)} maps in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
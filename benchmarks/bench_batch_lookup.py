@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from data import Data
+from game_logic import GameLogic
+
+MODES = ["countries", "rivers", "oceans", "mountains", "continents", "world_blocks"]
+
+
+def main(clicks=1_000_000, sample=20000):
+    game_logic = GameLogic(Data)
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(-180, 180, clicks)
+    lats = rng.uniform(-90, 90, clicks)
+
+    print(f"{clicks} clicks per mode, one-by-one time extrapolated from {sample}")
+    for mode in MODES:
+        game_logic.set_game_mode(mode)
+
+        start = time.perf_counter()
+        for lon, lat in zip(lons[:sample], lats[:sample]):
+            game_logic.get_item_from_coordinates(lon, lat)
+        one_by_one = (time.perf_counter() - start) * clicks / sample
+
+        start = time.perf_counter()
+        game_logic.get_items_from_coordinates(lons, lats)
+        batch = time.perf_counter() - start
+        print(f"{mode:>12}: one-by-one {one_by_one:7.2f} s, batch {batch:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
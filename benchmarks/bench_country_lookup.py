@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from data import Data
+from game_logic import GameLogic
+
+
+def linear_scan(bbox_list, lon, lat):
+    for country, bboxes in bbox_list.items():
+        for bbox in bboxes:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+                return country
+    return None
+
+
+def main(clicks=20000):
+    game_logic = GameLogic(Data)
+    game_logic.set_game_mode("countries")
+
+    random.seed(0)
+    points = [
+        (random.uniform(-180, 180), random.uniform(-90, 90)) for _ in range(clicks)
+    ]
+    bbox_list = game_logic.modes["countries"].bbox_list
+    subunits = sum(len(bboxes) for bboxes in bbox_list.values())
+    print(f"{len(bbox_list)} countries, {subunits} subunit bboxes")
+
+    scan = timeit.timeit(
+        lambda: [linear_scan(bbox_list, lon, lat) for lon, lat in points],
+        number=1,
+    )
+    index = timeit.timeit(
+        lambda: [game_logic.get_item_from_coordinates(lon, lat) for lon, lat in points],
+        number=1,
+    )
+    print(f"linear scan:   {scan / clicks * 1e6:8.2f} us/click")
+    print(f"spatial index: {index / clicks * 1e6:8.2f} us/click")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from data import Data
+from game_logic import GameLogic
+
+
+def main(clicks=20000):
+    game_logic = GameLogic(Data)
+    game_logic.set_game_mode("countries")
+    countries = game_logic.modes["countries"]
+
+    random.seed(0)
+    # Only clicks that pass the bbox filter reach the polygon test, so
+    # sample inside the country bboxes to measure the expensive path.
+    bboxes = [bbox for bboxes in countries.bbox_list.values() for bbox in bboxes]
+    points = []
+    for _ in range(clicks):
+        min_lon, min_lat, max_lon, max_lat = random.choice(bboxes)
+        points.append(
+            (random.uniform(min_lon, max_lon), random.uniform(min_lat, max_lat))
+        )
+
+    bbox_only = timeit.timeit(
+        lambda: [game_logic.get_item_from_coordinates(lon, lat) for lon, lat in points],
+        number=1,
+    )
+
+    start = time.perf_counter()
+    game_logic.set_exact_countries(True)
+    load = time.perf_counter() - start
+
+    exact = timeit.timeit(
+        lambda: [game_logic.get_item_from_coordinates(lon, lat) for lon, lat in points],
+        number=1,
+    )
+    changed = sum(
+        countries.hit_test(lon, lat) != countries.candidates(lon, lat)[0]
+        for lon, lat in points
+    )
+    print(f"loading and preparing polygons: {load:.2f} s")
+    print(f"bbox only:  {bbox_only / clicks * 1e6:8.2f} us/click")
+    print(f"exact:      {exact / clicks * 1e6:8.2f} us/click")
+    print(f"clicks answered differently in exact mode: {changed}/{clicks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cartopy.crs as ccrs
+import matplotlib.pyplot as plt
+
+from data import Data
+from map_renderer import MapRenderer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROJECTIONS = [
+    ccrs.PlateCarree(),
+    ccrs.AlbersEqualArea(),
+    ccrs.Sinusoidal(),
+    ccrs.InterruptedGoodeHomolosine(),
+    ccrs.NearsidePerspective(),
+    ccrs.LambertCylindrical(),
+    ccrs.RotatedPole(),
+]
+
+
+def main(rounds=3):
+    figure = plt.figure(figsize=(20, 5))
+    image_path = os.path.join(ROOT, "etopo.jpg")
+    renderer = MapRenderer(figure, figure.canvas, image_path)
+    rivers = Data.get("rivieren")
+
+    for hard_mode in (False, True):
+        print(f"hard mode: {hard_mode}")
+        for round_number in range(rounds):
+            for projection in PROJECTIONS:
+                start = time.perf_counter()
+                renderer.set_projection(projection, hard_mode, rivers)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"  round {round_number} {type(projection).__name__:<28}"
+                    f"{elapsed * 1000:9.1f} ms"
+                )
+    print(renderer.basemaps.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+BACKENDS = ["matplotlib", "tk"]
+HINT_ITEMS = 20
+
+
+def create_renderer(backend, root):
+    # The same widgets game.py builds, without a RenderWorker so every
+    # frame is drawn before the timer stops.
+    frame = tk.Frame(root)
+    frame.pack(fill=tk.BOTH, expand=True)
+    if backend == "tk":
+        from tk_renderer import TkCanvasRenderer
+
+        renderer = TkCanvasRenderer(frame)
+        renderer.canvas.pack(fill=tk.BOTH, expand=True)
+        return renderer
+
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    import matplotlib.pyplot as plt
+    from map_renderer import MapRenderer
+
+    figure = plt.figure(figsize=(20, 5))
+    canvas = FigureCanvasTkAgg(figure, master=frame)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    return MapRenderer(figure, canvas, os.path.join(ROOT, "etopo.jpg"))
+
+
+def frame_time(root, action):
+    start = time.perf_counter()
+    action()
+    root.update()
+    return (time.perf_counter() - start) * 1000
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_backend(backend):
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        print(f"{backend}: no display ({error})")
+        return
+    root.geometry("1200x800")
+    root.update()
+
+    import cartopy.crs as ccrs
+    from game_logic import GameLogic
+    from geopack import load_data
+
+    logic = GameLogic(load_data())
+    rivers = logic.modes["rivers"].dataset
+    countries = logic.modes["countries"]
+    countries.load()
+    items = countries.question_pool()[:HINT_ITEMS]
+    projections = [
+        ccrs.PlateCarree(),
+        ccrs.AlbersEqualArea(),
+        ccrs.Sinusoidal(),
+        ccrs.InterruptedGoodeHomolosine(),
+        ccrs.NearsidePerspective(),
+    ]
+    rss_before = peak_rss_mb()
+
+    renderer = create_renderer(backend, root)
+    print(f"{backend}:")
+    for hard_mode in (False, True):
+        for projection in projections:
+            times = [
+                frame_time(
+                    root,
+                    lambda: renderer.set_projection(projection, hard_mode, rivers),
+                )
+                for _ in range(3)
+            ]
+            print(
+                f"  switch {type(projection).__name__:<28} hard={hard_mode!s:<6}"
+                f"cold {times[0]:8.1f} ms  warm {min(times[1:]):8.1f} ms"
+            )
+
+    hints = []
+    for item in items:
+        geometry = countries.hint_geometry(item)
+        hints.append(
+            frame_time(
+                root,
+                lambda: (
+                    renderer.show_item(item, geometry, "hint"),
+                    renderer.blit(),
+                ),
+            )
+        )
+        frame_time(root, lambda: (renderer.clear_overlays(), renderer.blit()))
+    hints.sort()
+    print(
+        f"  hint frame  median {hints[len(hints) // 2]:8.1f} ms"
+        f"  worst {hints[-1]:8.1f} ms"
+    )
+    print(
+        f"  peak RSS {peak_rss_mb():8.1f} MB"
+        f" ({peak_rss_mb() - rss_before:+.1f} MB for the renderer)"
+    )
+    root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Frame time and memory of the matplotlib and tk.Canvas renderers"
+    )
+    parser.add_argument("--backend", choices=BACKENDS)
+    args = parser.parse_args()
+    if args.backend:
+        run_backend(args.backend)
+        return
+    # One fresh process per backend, so neither sees the other's memory.
+    for backend in BACKENDS:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--backend", backend],
+            cwd=ROOT,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
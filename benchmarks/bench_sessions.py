@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from game_logic import GameLogic
+from geopack import load_data
+from session import Session
+
+MODES = ["countries", "rivers", "oceans", "mountains", "continents", "world_blocks"]
+
+
+def answer_point(geometry):
+    # Somewhere on the item: the middle of its first bbox or line vertex.
+    if geometry.bboxes:
+        min_lon, min_lat, max_lon, max_lat = geometry.bboxes[0]
+        return (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+    return tuple(geometry.lines[0][len(geometry.lines[0]) // 2])
+
+
+def play(session, rng, rounds, answers):
+    # A simulated player: sometimes asks for a hint, mostly clicks the
+    # answer and otherwise clicks anywhere, and moves on after every click.
+    events = 0
+    session.start()
+    for _ in range(rounds):
+        if rng.random() < 0.2:
+            events += session.hint() is not None
+        if rng.random() < 0.7:
+            lon, lat = answers[session.asked_item]
+        else:
+            lon, lat = rng.uniform(-180, 180), rng.uniform(-90, 90)
+        events += session.click(lon, lat) is not None
+        session.next_round()
+    return events
+
+
+def main(sessions=2000, rounds=10):
+    logic = GameLogic(load_data())
+    rng = random.Random(0)
+    counted = []
+    print(f"{sessions} sessions of {rounds} rounds per mode")
+    for mode in MODES:
+        logic.load_mode(mode)
+        entry = logic.modes[mode]
+        answers = {
+            item: answer_point(entry.hint_geometry(item))
+            for item in entry.question_pool()
+        }
+
+        start = time.perf_counter()
+        events = 0
+        scores = 0
+        for _ in range(sessions):
+            session = Session(logic, mode, counted.append, rng)
+            events += play(session, rng, rounds, answers)
+            scores += session.score
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:>12}: {sessions / elapsed:9.0f} sessions/s"
+            f"  {sessions * rounds / elapsed:9.0f} rounds/s"
+            f"  mean score {scores / sessions:5.2f}"
+        )
+    print(f"{len(counted)} events delivered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+class ClickDispatcher:
+    # Hands map clicks, as lon/lat, to whatever handler is routed to the
+    # current map. The renderer reports clicks through push (it owns the one
+    # click connection for the app's lifetime and knows how to turn a click
+    # into lon/lat). Clicks are not handled inline: the latest one is kept
+    # and dispatched from `schedule` (Tk's after_idle), so a burst of
+    # clicks queued up behind a redraw collapses into a single dispatch.
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.ax = None
+        self.handler = None
+        self.pending = None
+        self.scheduled = False
+        self.dispatched = 0
+        self.coalesced = 0
+
+    def route(self, ax, handler):
+        # Anything still pending was clicked on the previous map.
+        self.ax = ax
+        self.handler = handler
+        self.pending = None
+
+    def push(self, ax, lon, lat):
+        if self.ax is None or ax is not self.ax:
+            return
+        if self.pending is not None:
+            self.coalesced += 1
+        self.pending = (lon, lat)
+        if not self.scheduled:
+            self.scheduled = True
+            self.schedule(self._dispatch)
+
+    def _dispatch(self):
+        self.scheduled = False
+        if self.pending is None:
+            return
+        lon, lat = self.pending
+        self.pending = None
+        self.dispatched += 1
+        self.handler(lon, lat)
@@ -0,0 +1,21 @@
+import time
+
+
+class DataRegistry:
+    def __init__(self, loaders):
+        self.loaders = loaders
+        self.timings = {}
+        self._datasets = {}
+
+    def types(self):
+        return list(self.loaders.keys())
+
+    def get(self, data_type):
+        if data_type not in self._datasets:
+            loader = self.loaders.get(data_type)
+            if loader is None:
+                return {}
+            start = time.perf_counter()
+            self._datasets[data_type] = loader()
+            self.timings[data_type] = time.perf_counter() - start
+        return self._datasets[data_type]
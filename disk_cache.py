@@ -0,0 +1,61 @@
+import functools
+import hashlib
+import os
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def cache_path(*parts):
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def file_digest(*paths, extra=()):
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    for value in extra:
+        digest.update(str(value).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(path, mtime, size):
+    return file_digest(path)
+
+
+def source_digest(path):
+    # Hashing a large source file costs a few ms, so only do it again when
+    # the file changes on disk.
+    stat = os.stat(path)
+    return _source_digest(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def save_array(path, array):
+    # Write to a temporary file first so an interrupted save never leaves a
+    # truncated .npy behind.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def save_arrays(path, **arrays):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def remove_stale(directory, prefix, keep):
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name != keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
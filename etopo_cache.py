@@ -0,0 +1,143 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from disk_cache import (
+    cache_path,
+    file_digest,
+    remove_stale,
+    save_array,
+    source_digest,
+)
+
+# cartopy's own default for GeoAxes.imshow: the shorter side of the warped
+# image has this many pixels.
+REGRID_SHAPE = 750
+
+# The random hard-mode projections from GameGUI plus the AlbersEqualArea
+# toggle; PlateCarree is left out because etopo is already in PlateCarree.
+WARM_UP_PROJECTIONS = [
+    "Sinusoidal",
+    "InterruptedGoodeHomolosine",
+    "NearsidePerspective",
+    "LambertCylindrical",
+    "RotatedPole",
+    "AlbersEqualArea",
+]
+
+SOURCE_EXTENT = (-180, 180, -90, 90)
+
+
+def target_extent(projection):
+    return (*projection.x_limits, *projection.y_limits)
+
+
+def _regrid_shape(resolution, extent):
+    # Same aspect handling as GeoAxes._regrid_shape_aspect.
+    x_range = extent[1] - extent[0]
+    y_range = extent[3] - extent[2]
+    if x_range >= y_range:
+        return (int(resolution * x_range / y_range), resolution)
+    return (resolution, int(resolution * y_range / x_range))
+
+
+def warp_image(image, projection, resolution=REGRID_SHAPE):
+    # What GeoAxes.imshow does for an upper-origin PlateCarree image on a
+    # global map, returned as an RGBA uint8 array with lower origin and
+    # transparent pixels outside the projection's domain.
+    import cartopy.crs as ccrs
+    from cartopy.img_transform import warp_array
+
+    extent = target_extent(projection)
+    warped, _ = warp_array(
+        np.asanyarray(image)[::-1],
+        source_proj=ccrs.PlateCarree(),
+        source_extent=SOURCE_EXTENT,
+        target_proj=projection,
+        target_res=_regrid_shape(resolution, extent),
+        target_extent=extent,
+        mask_extrapolated=True,
+    )
+    rgba = np.empty(warped.shape[:2] + (4,), dtype=np.uint8)
+    rgba[:, :, :3] = np.ma.getdata(warped)[:, :, :3]
+    rgba[:, :, 3] = 255
+    mask = np.ma.getmaskarray(warped)
+    rgba[np.any(mask[:, :, :3], axis=2), 3] = 0
+    return rgba
+
+
+def warped_path(path, projection, resolution=REGRID_SHAPE):
+    digest = file_digest(
+        extra=(source_digest(path), projection.srs, target_extent(projection))
+    )
+    prefix = f"{type(projection).__name__}-{resolution}-"
+    return cache_path("etopo", f"{prefix}{digest}.npy")
+
+
+def load_or_warp(path, projection, resolution=REGRID_SHAPE, image=None):
+    # Cached per projection and resolution; the file name carries a digest
+    # of the source image, so a new etopo.jpg invalidates old entries.
+    warped = warped_path(path, projection, resolution)
+    if os.path.exists(warped):
+        return np.load(warped, mmap_mode="r"), target_extent(projection)
+    if image is None:
+        import matplotlib.pyplot as plt
+
+        image = plt.imread(path)
+    rgba = warp_image(image, projection, resolution)
+    save_array(warped, rgba)
+    prefix = f"{type(projection).__name__}-{resolution}-"
+    remove_stale(os.path.dirname(warped), prefix, os.path.basename(warped))
+    return rgba, target_extent(projection)
+
+
+def _warm_up_one(path, projection_name, resolution):
+    import cartopy.crs as ccrs
+
+    projection = getattr(ccrs, projection_name)()
+    warped = warped_path(path, projection, resolution)
+    if os.path.exists(warped):
+        return projection_name, resolution, 0.0
+    start = time.perf_counter()
+    load_or_warp(path, projection, resolution)
+    return projection_name, resolution, time.perf_counter() - start
+
+
+def warm_up(path, projections=WARM_UP_PROJECTIONS, resolutions=(REGRID_SHAPE,)):
+    jobs = [(name, resolution) for name in projections for resolution in resolutions]
+    with ProcessPoolExecutor() as pool:
+        futures = [
+            pool.submit(_warm_up_one, path, name, resolution)
+            for name, resolution in jobs
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-warp the etopo image for every game projection."
+    )
+    parser.add_argument(
+        "--image",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "etopo.jpg"),
+    )
+    parser.add_argument("--resolution", type=int, action="append", dest="resolutions")
+    parser.add_argument(
+        "--projection", action="append", dest="projections", choices=WARM_UP_PROJECTIONS
+    )
+    args = parser.parse_args()
+    results = warm_up(
+        args.image,
+        args.projections or WARM_UP_PROJECTIONS,
+        args.resolutions or (REGRID_SHAPE,),
+    )
+    for name, resolution, elapsed in results:
+        state = f"{elapsed:.2f} s" if elapsed else "cached"
+        print(f"{name:<28}{resolution:>6}  {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+
+import cartopy.feature as cfeature
+import numpy as np
+from cartopy.io import shapereader
+from cartopy.mpl.path import shapely_to_path
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+
+from disk_cache import cache_path, file_digest, remove_stale, save_arrays, source_digest
+
+# The Natural Earth layers the basemap draws, with the style arguments
+# add_feature used to get.
+FEATURES = {
+    "land": (cfeature.LAND, {}),
+    "ocean": (cfeature.OCEAN, {}),
+    "coastline": (cfeature.COASTLINE, {}),
+    "borders": (cfeature.BORDERS, {"linestyle": ":"}),
+    "lakes": (cfeature.LAKES, {"alpha": 0.5}),
+    "rivers": (cfeature.RIVERS, {}),
+}
+
+GLOBAL_EXTENT = (-180, 180, -90, 90)
+
+
+class FeatureCache:
+    # Natural Earth layers projected once per projection and kept as
+    # matplotlib paths, in memory and (with use_disk) under cache/features,
+    # so a projection seen before never reprojects a shapefile again.
+    def __init__(self, use_disk=True):
+        self.use_disk = use_disk
+        self.paths = {}
+
+    def get_paths(self, name, projection):
+        key = (name, projection)
+        paths = self.paths.get(key)
+        if paths is None:
+            paths = self._load_or_project(name, projection)
+            self.paths[key] = paths
+        return paths
+
+    def _load_or_project(self, name, projection):
+        feature, _ = FEATURES[name]
+        # The game maps are always global, which picks the feature's scale.
+        feature.scaler.scale_from_extent(GLOBAL_EXTENT)
+        if not self.use_disk:
+            return _project(feature.geometries(), feature.crs, projection)
+
+        source = shapereader.natural_earth(
+            resolution=feature.scale, category=feature.category, name=feature.name
+        )
+        prefix = f"{name}-{feature.scale}-{type(projection).__name__}-"
+        digest = file_digest(
+            extra=(source_digest(source), projection.srs, projection.bounds)
+        )
+        path = cache_path("features", f"{prefix}{digest}.npz")
+        if os.path.exists(path):
+            with np.load(path) as arrays:
+                return _unpack_paths(
+                    arrays["vertices"], arrays["codes"], arrays["offsets"]
+                )
+        paths = _project(feature.geometries(), feature.crs, projection)
+        save_arrays(path, **_pack_paths(paths))
+        remove_stale(os.path.dirname(path), prefix, os.path.basename(path))
+        return paths
+
+    def collection(self, name, projection, ax):
+        # Drawn like cartopy's FeatureArtist: feature style, then the
+        # add_feature overrides, clipped to the map outline.
+        feature, overrides = FEATURES[name]
+        style = {"zorder": 1.5, **feature.kwargs, **overrides}
+        if isinstance(style.get("facecolor"), str) and style["facecolor"] == "never":
+            style["facecolor"] = "none"
+        collection = PathCollection(
+            self.get_paths(name, projection), transform=ax.transData, **style
+        )
+        collection.set_clip_path(ax.patch)
+        return collection
+
+
+def _project(geometries, source_crs, projection):
+    paths = []
+    for geometry in geometries:
+        if projection != source_crs:
+            geometry = projection.project_geometry(geometry, source_crs)
+        if not geometry.is_empty:
+            paths.append(shapely_to_path(geometry))
+    return paths
+
+
+def _pack_paths(paths):
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(path.vertices) for path in paths])
+    vertices = np.concatenate(
+        [path.vertices for path in paths] or [np.empty((0, 2))]
+    ).astype(np.float64)
+    codes = np.concatenate(
+        [
+            path.codes if path.codes is not None else _line_codes(len(path.vertices))
+            for path in paths
+        ]
+        or [np.empty(0)]
+    ).astype(np.uint8)
+    return {"vertices": vertices, "codes": codes, "offsets": offsets}
+
+
+def _line_codes(count):
+    codes = np.full(count, Path.LINETO, dtype=np.uint8)
+    codes[:1] = Path.MOVETO
+    return codes
+
+
+def _unpack_paths(vertices, codes, offsets):
+    return [
+        Path(vertices[start:end], codes[start:end])
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
@@ -1,37 +1,43 @@
+from startup import BackgroundLoader, StartupProfile, import_time_report
+from session import Answered, HintShown, OutOfItems, RoundStarted, ScoreChanged, Session
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import cartopy.feature as cfeature
-import cartopy.crs as ccrs
-import matplotlib.pyplot as plt
-from data import Data
-from game_logic import GameLogic
+from tkinter import ttk
+import argparse
+import importlib
 import random
 import os
 import sys
 
+# Imported on the startup thread, after the window is up, per renderer.
+DEFERRED_IMPORTS = {
+    "matplotlib": [
+        "matplotlib.backends.backend_tkagg",
+        "cartopy.crs",
+        "map_renderer",
+        "geopack",
+        "game_logic",
+    ],
+    "tk": [
+        "cartopy.crs",
+        "tk_renderer",
+        "geopack",
+        "game_logic",
+    ],
+}
+
 
 class GameGUI:
-    def __init__(self, root):
+    def __init__(self, root, profile=None, backend="matplotlib"):
         self.root = root
         self.root.title("Geografie Spel")
         self.root.geometry("1200x800")
         self.root.attributes("-fullscreen", False)
+        self.profile = profile or StartupProfile()
+        self.backend = backend
 
-        countries_data = self.extract_data_by_type("landen")
-        rivers_data = self.extract_data_by_type("rivieren")
-        oceans_data = self.extract_data_by_type("oceanen")
-        mountains_data = self.extract_data_by_type("bergen")
-        continents_data = self.extract_data_by_type("continenten")
-        world_blocks_data = self.extract_data_by_type("wereldblokken")
-
-        self.game_logic = GameLogic(
-            countries_data,
-            rivers_data,
-            oceans_data,
-            mountains_data,
-            continents_data,
-            world_blocks_data,
-        )
+        self.game_logic = None
+        self.session = None
+        self.renderer = None
 
         self.main_frame = tk.Frame(self.root)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -45,43 +51,11 @@ class GameGUI:
         self.mode_frame = tk.Frame(self.control_frame)
         self.mode_frame.pack(pady=10)
 
-        self.countries_button = tk.Button(
-            self.mode_frame,
-            text="Countries",
-            command=lambda: self.set_game_mode("countries"),
-        )
-        self.countries_button.pack(side=tk.LEFT, padx=5)
-
-        self.rivers_button = tk.Button(
-            self.mode_frame, text="Rivers", command=lambda: self.set_game_mode("rivers")
-        )
-        self.rivers_button.pack(side=tk.LEFT, padx=5)
-
-        self.oceans_button = tk.Button(
-            self.mode_frame, text="Oceans", command=lambda: self.set_game_mode("oceans")
-        )
-        self.oceans_button.pack(side=tk.LEFT, padx=5)
-
-        self.mountains_button = tk.Button(
-            self.mode_frame,
-            text="Mountains",
-            command=lambda: self.set_game_mode("mountains"),
-        )
-        self.mountains_button.pack(side=tk.LEFT, padx=5)
-
-        self.continents_button = tk.Button(
-            self.mode_frame,
-            text="Continents",
-            command=lambda: self.set_game_mode("continents"),
+        self.mode_buttons = {}
+        self.progress = ttk.Progressbar(
+            self.mode_frame, maximum=len(self.startup_stages()), length=250
         )
-        self.continents_button.pack(side=tk.LEFT, padx=5)
-
-        self.world_blocks_button = tk.Button(
-            self.mode_frame,
-            text="World Blocks",
-            command=lambda: self.set_game_mode("world_blocks"),
-        )
-        self.world_blocks_button.pack(side=tk.LEFT, padx=5)
+        self.progress.pack()
 
         self.score_label = tk.Label(
             self.control_frame, text="Score: 0", font=("Arial", 16)
@@ -89,7 +63,7 @@ class GameGUI:
         self.score_label.pack(pady=10)
 
         self.question_label = tk.Label(
-            self.control_frame, text="Select a game mode", font=("Arial", 14)
+            self.control_frame, text="Loading...", font=("Arial", 14)
         )
         self.question_label.pack(pady=10)
 
@@ -105,9 +79,19 @@ class GameGUI:
             self.control_frame, text="Hint", command=self.show_hint, state=tk.DISABLED
         )
         self.hard_mode_button = tk.Button(
-            self.control_frame, text="Hard Mode", command=self.toggle_hard_mode
+            self.control_frame,
+            text="Hard Mode",
+            command=self.toggle_hard_mode,
+            state=tk.DISABLED,
         )
         self.hard_mode_button.pack(pady=10)
+        self.exact_borders_button = tk.Button(
+            self.control_frame,
+            text="Exact Borders",
+            command=self.toggle_exact_borders,
+            state=tk.DISABLED,
+        )
+        self.exact_borders_button.pack(pady=10)
         self.hint_button.pack(pady=10)
 
         self.next_button = tk.Button(
@@ -118,10 +102,65 @@ class GameGUI:
         self.listbox = tk.Listbox(self.control_frame)
         self.listbox.pack(fill=tk.BOTH, expand=True)
         self.image_path = self.resource_path("./etopo.jpg")
-        self.image_easy = plt.imread(self.image_path)
 
-        self.figure = plt.figure(figsize=(20, 5))
-        self.ax = self.figure.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+        # The controls are on screen now; everything heavy happens in the
+        # background and finish_startup builds the map once it is done.
+        self.profile.mark("window")
+        self.loader = BackgroundLoader(
+            self.root,
+            self.startup_stages(),
+            self.show_startup_progress,
+            self.finish_startup,
+            self.startup_failed,
+            self.profile,
+        )
+        self.root.after_idle(self.loader.start)
+
+    def startup_stages(self):
+        stages = [
+            (
+                module,
+                f"import {module}",
+                lambda results, module=module: importlib.import_module(module),
+            )
+            for module in DEFERRED_IMPORTS[self.backend]
+        ]
+        stages.append(("logic", "load game data", self.load_game_logic))
+        return stages
+
+    def load_game_logic(self, results):
+        from geopack import load_data
+        from game_logic import GameLogic
+
+        game_logic = GameLogic(load_data())
+        # The basemap needs the rivers right away.
+        game_logic.modes["rivers"].dataset
+        return game_logic
+
+    def show_startup_progress(self, index, label):
+        self.progress["value"] = index
+        self.question_label.config(text=f"Loading...\n{label}")
+
+    def startup_failed(self, error):
+        self.question_label.config(text=f"Loading failed:\n{error}")
+
+    def finish_startup(self, results):
+        import cartopy.crs as ccrs
+        from click_dispatcher import ClickDispatcher
+
+        self.game_logic = results["logic"]
+        self.progress.destroy()
+        for mode, entry in self.game_logic.modes.items():
+            button = tk.Button(
+                self.mode_frame,
+                text=entry.label,
+                command=lambda mode=mode: self.set_game_mode(mode),
+            )
+            button.pack(side=tk.LEFT, padx=5)
+            self.mode_buttons[mode] = button
+        self.hard_mode_button.config(state=tk.NORMAL)
+        self.exact_borders_button.config(state=tk.NORMAL)
+        self.question_label.config(text="Select a game mode")
 
         self.projections = [
             ccrs.Sinusoidal(),
@@ -131,45 +170,53 @@ class GameGUI:
             ccrs.RotatedPole(),
         ]
 
+        self.next_projection = None
+        self.renderer = self.create_renderer()
+        self.clicks = ClickDispatcher(self.root.after_idle)
+        self.renderer.connect_clicks(self.clicks.push)
+        self.init_map(ccrs.PlateCarree())
+        self.profile.mark("map created")
+        if self.profile.enabled:
+            self.root.after(0, self.report_startup)
+
+    def create_renderer(self):
+        from render_worker import RenderWorker
+
+        worker = RenderWorker(self.root)
+        if self.backend == "tk":
+            from tk_renderer import TkCanvasRenderer
+
+            renderer = TkCanvasRenderer(self.map_frame, worker=worker)
+            renderer.canvas.pack(fill=tk.BOTH, expand=True)
+            return renderer
+
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import matplotlib.pyplot as plt
+        from map_renderer import MapRenderer
+
+        self.figure = plt.figure(figsize=(20, 5))
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.map_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return MapRenderer(self.figure, self.canvas, self.image_path, worker=worker)
 
-        self.init_map()
-
-    def extract_data_by_type(self, data_type):
-        for item in Data:
-            if item["type"] == data_type:
-                return item["data"]
-        return {}
-
-    def init_map(self):
-        self.ax.clear()
-        if not self.game_logic.hard_mode:
-            self.ax.imshow(
-                self.image_easy,
-                origin="upper",
-                extent=(-180, 180, -90, 90),
-                transform=ccrs.PlateCarree(),
-            )
-        else:
-            self.ax.add_feature(cfeature.LAND)
-            self.ax.add_feature(cfeature.OCEAN)
-        self.ax.add_feature(cfeature.COASTLINE)
-        self.ax.add_feature(cfeature.BORDERS, linestyle=":")
-        self.ax.add_feature(cfeature.LAKES, alpha=0.5)
-        self.ax.add_feature(cfeature.RIVERS)
-        self.ax.set_title("Geografie Spel")
-        self.ax.set_global()
-
-        if self.game_logic.rivers:
-            for river, data in self.game_logic.rivers.items():
-                lons, lats = zip(*data["coordinates"])
-                self.ax.plot(
-                    lons, lats, color="blue", linewidth=2, transform=ccrs.Geodetic()
-                )
-
-        self.figure.canvas.mpl_connect("button_press_event", self.on_map_click)
-        self.canvas.draw()
+    def report_startup(self):
+        # Waits for the first basemap frame, which renders in the background.
+        if self.renderer.rendering:
+            self.root.after(20, self.report_startup)
+            return
+        # Flushes the pending redraw of the first frame.
+        self.root.update_idletasks()
+        self.profile.mark("first frame")
+        self.profile.report()
+        print(import_time_report(DEFERRED_IMPORTS[self.backend]))
+
+    def init_map(self, projection):
+        self.renderer.set_projection(
+            projection,
+            self.game_logic.hard_mode,
+            self.game_logic.modes["rivers"].dataset,
+        )
+        self.clicks.route(self.renderer.ax, self.on_map_click)
 
     def resource_path(self, relative_path):
         try:
@@ -179,6 +226,7 @@ class GameGUI:
 
     def set_game_mode(self, mode):
         self.game_logic.set_game_mode(mode)
+        self.session = Session(self.game_logic, mode, self.on_session_event)
         self.start_button.config(state=tk.NORMAL)
         self.question_label.config(
             text=f"Game mode: {mode.capitalize()}\nClick 'Start Game' to begin"
@@ -186,273 +234,151 @@ class GameGUI:
         self.populate_listbox()
 
     def start_game(self):
-        self.game_logic.score = 0
-        self.update_score_label()
         self.hint_button.config(state=tk.NORMAL)
-        self.next_round()
+        self.clear_map()
+        self.session.start()
 
     def next_round(self):
-        self.init_map()
-        self.next_button.config(state=tk.DISABLED)
-        asked_item = self.game_logic.ask_random_item()
-        if asked_item:
-            if self.game_logic.hard_mode:
-                self.toggle_new_map()
-            self.question_label.config(text=f"Locate: {asked_item}")
-        else:
-            self.question_label.config(text="No more items in this category!")
-
-    def on_map_click(self, event):
-        if event.inaxes != self.ax or not self.game_logic.game_mode:
-            return
+        self.clear_map()
+        self.session.next_round()
 
-        lon, lat = ccrs.PlateCarree().transform_point(
-            event.xdata, event.ydata, self.ax.projection
-        )
-        clicked_item = self.game_logic.get_item_from_coordinates(lon, lat)
+    def clear_map(self):
+        self.renderer.clear_overlays()
+        self.renderer.blit()
+        self.next_button.config(state=tk.DISABLED)
 
-        if clicked_item:
-            is_correct = self.game_logic.check_answer(clicked_item)
-            self.update_score_label()
-            self.show_feedback(lon, lat, clicked_item, is_correct)
-            if is_correct:
-                self.root.after(1000, self.next_round)
+    def on_map_click(self, lon, lat):
+        if self.session is not None:
+            self.session.click(lon, lat)
 
     def show_hint(self):
-        if not self.game_logic.asked_item:
-            return
+        self.session.hint()
 
-        item_data = self.game_logic.get_item_data(self.game_logic.asked_item)
-        if not item_data:
-            return
-
-        if self.game_logic.game_mode == "countries":
-            if item_data and item_data.get("bbox"):
-                for bbox in item_data["bbox"]:
-                    min_lon, min_lat, max_lon, max_lat = bbox
-                    self.ax.add_patch(
-                        plt.Rectangle(
-                            (min_lon, min_lat),
-                            max_lon - min_lon,
-                            max_lat - min_lat,
-                            fill=True,
-                            edgecolor="yellow",
-                            facecolor="yellow",
-                            alpha=0.5,
-                            transform=ccrs.PlateCarree(),
-                        )
-                    )
-        elif self.game_logic.game_mode == "rivers":
-            lons, lats = zip(*item_data["coordinates"])
-            self.ax.plot(
-                lons,
-                lats,
-                color="yellow",
-                linewidth=10,
-                alpha=0.5,
-                transform=ccrs.Geodetic(),
-            )
-        elif self.game_logic.game_mode == "oceans":
-            min_lon, min_lat, max_lon, max_lat = item_data["bbox"]
-            self.ax.add_patch(
-                plt.Rectangle(
-                    (min_lon, min_lat),
-                    max_lon - min_lon,
-                    max_lat - min_lat,
-                    fill=True,
-                    edgecolor="yellow",
-                    facecolor="yellow",
-                    alpha=0.5,
-                    transform=ccrs.PlateCarree(),
-                )
-            )
-        elif self.game_logic.game_mode == "mountains":
-            min_lon, min_lat, max_lon, max_lat = item_data["bbox"]
-            self.ax.add_patch(
-                plt.Rectangle(
-                    (min_lon, min_lat),
-                    max_lon - min_lon,
-                    max_lat - min_lat,
-                    fill=True,
-                    edgecolor="yellow",
-                    facecolor="yellow",
-                    alpha=0.5,
-                    transform=ccrs.PlateCarree(),
-                )
-            )
-        elif self.game_logic.game_mode in ["continents", "world_blocks"]:
-            for bbox in item_data["bbox"]:
-                min_lon, min_lat, max_lon, max_lat = bbox
-                self.ax.add_patch(
-                    plt.Rectangle(
-                        (min_lon, min_lat),
-                        max_lon - min_lon,
-                        max_lat - min_lat,
-                        fill=True,
-                        edgecolor="yellow",
-                        facecolor="yellow",
-                        alpha=0.5,
-                        transform=ccrs.PlateCarree(),
-                    )
-                )
-
-        self.canvas.draw()
-        self.game_logic.score -= 1
-        self.update_score_label()
+    def on_session_event(self, event):
+        # The session decides what happens; this only shows it.
+        if isinstance(event, RoundStarted):
+            if self.game_logic.hard_mode:
+                self.toggle_new_map()
+            self.question_label.config(text=f"Locate: {event.item}")
+            self.prefetch_next_round()
+        elif isinstance(event, OutOfItems):
+            self.question_label.config(text="No more items in this category!")
+        elif isinstance(event, Answered):
+            self.show_feedback(event)
+            if event.correct:
+                self.root.after(1000, self.next_round)
+        elif isinstance(event, HintShown):
+            self.renderer.show_item(event.item, event.geometry, "hint")
+            self.renderer.blit()
+        elif isinstance(event, ScoreChanged):
+            self.score_label.config(text=f"Score: {event.score}")
 
     def toggle_hard_mode(self):
         self.game_logic.hard_mode = not self.game_logic.hard_mode
         mode_text = "ON" if self.game_logic.hard_mode else "OFF"
         self.hard_mode_button.config(text=f"Hard Mode: {mode_text}")
 
-        self.figure.clear()
+        import cartopy.crs as ccrs
 
         if self.game_logic.hard_mode:
-            self.ax = self.figure.add_subplot(
-                1, 1, 1, projection=ccrs.AlbersEqualArea()
-            )
+            self.init_map(ccrs.AlbersEqualArea())
         else:
-            self.ax = self.figure.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+            self.init_map(ccrs.PlateCarree())
 
-        self.init_map()
+    def toggle_exact_borders(self):
+        if self.game_logic.exact_countries:
+            self.set_exact_borders(False)
+            return
+        # The borders may have to be downloaded first; that happens in the
+        # background and set_exact_borders picks them up from the cache.
+        from geodata import fetch_country_shapes
 
-    def toggle_new_map(self):
-        random.choice(self.projections)
-        self.figure.clear()
-        self.ax = self.figure.add_subplot(
-            1, 1, 1, projection=random.choice(self.projections)
+        self.exact_borders_button.config(
+            text="Exact Borders: loading...", state=tk.DISABLED
         )
-        self.init_map()
-
-    def show_feedback(self, lon, lat, clicked_item, is_correct):
-        self.init_map()
-
-        color = "green" if is_correct else "red"
-        self.ax.plot(
-            lon,
-            lat,
-            marker="o",
-            color=color,
-            markersize=8,
-            transform=ccrs.PlateCarree(),
+        BackgroundLoader(
+            self.root,
+            [
+                (
+                    "shapes",
+                    "load country borders",
+                    lambda results: fetch_country_shapes(),
+                )
+            ],
+            lambda index, label: None,
+            lambda results: self.set_exact_borders(True),
+            self.exact_borders_failed,
+            StartupProfile(),
+        ).start()
+
+    def set_exact_borders(self, enabled):
+        try:
+            self.game_logic.set_exact_countries(enabled)
+        except OSError as error:
+            self.exact_borders_failed(error)
+            return
+        self.show_exact_borders()
+
+    def exact_borders_failed(self, error):
+        self.question_label.config(text="Country borders could not be loaded")
+        self.show_exact_borders()
+
+    def show_exact_borders(self):
+        mode_text = "ON" if self.game_logic.exact_countries else "OFF"
+        self.exact_borders_button.config(
+            text=f"Exact Borders: {mode_text}", state=tk.NORMAL
         )
 
-        if not is_correct:
-            self.next_button.config(state=tk.NORMAL)
-            item_data = self.game_logic.get_item_data(self.game_logic.asked_item)
-            if self.game_logic.game_mode == "countries":
-                if item_data and item_data.get("bbox"):
-                    for bbox in item_data["bbox"]:
-                        min_lon, min_lat, max_lon, max_lat = bbox
-                        self.ax.add_patch(
-                            plt.Rectangle(
-                                (min_lon, min_lat),
-                                max_lon - min_lon,
-                                max_lat - min_lat,
-                                fill=False,
-                                edgecolor="green",
-                                linewidth=2,
-                                transform=ccrs.PlateCarree(),
-                            )
-                        )
-            elif self.game_logic.game_mode == "rivers":
-                lons, lats = zip(*item_data["coordinates"])
-                self.ax.plot(
-                    lons, lats, color="green", linewidth=2, transform=ccrs.Geodetic()
-                )
-            elif self.game_logic.game_mode == "oceans":
-                min_lon, min_lat, max_lon, max_lat = item_data["bbox"]
-                self.ax.add_patch(
-                    plt.Rectangle(
-                        (min_lon, min_lat),
-                        max_lon - min_lon,
-                        max_lat - min_lat,
-                        fill=False,
-                        edgecolor="green",
-                        linewidth=2,
-                        transform=ccrs.PlateCarree(),
-                    )
-                )
-            elif self.game_logic.game_mode == "mountains":
-                min_lon, min_lat, max_lon, max_lat = item_data["bbox"]
-                self.ax.add_patch(
-                    plt.Rectangle(
-                        (min_lon, min_lat),
-                        max_lon - min_lon,
-                        max_lat - min_lat,
-                        fill=False,
-                        edgecolor="green",
-                        linewidth=2,
-                        transform=ccrs.PlateCarree(),
-                    )
-                )
-            elif self.game_logic.game_mode in ["continents", "world_blocks"]:
-                if item_data and item_data.get("bbox"):
-                    for bbox in item_data["bbox"]:
-                        min_lon, min_lat, max_lon, max_lat = bbox
-                        self.ax.add_patch(
-                            plt.Rectangle(
-                                (min_lon, min_lat),
-                                max_lon - min_lon,
-                                max_lat - min_lat,
-                                fill=False,
-                                edgecolor="green",
-                                linewidth=2,
-                                transform=ccrs.PlateCarree(),
-                            )
-                        )
-
-        title = f"{clicked_item} - {'Correct!' if is_correct else 'Wrong!'}"
-        self.ax.set_title(title)
-
-        if self.game_logic.game_mode == "rivers" and self.game_logic.rivers:
-            for river, data in self.game_logic.rivers.items():
-                lons, lats = zip(*data["coordinates"])
-                self.ax.plot(
-                    lons, lats, color="blue", linewidth=2, transform=ccrs.Geodetic()
-                )
+    def toggle_new_map(self):
+        projection = self.next_projection or random.choice(self.projections)
+        self.next_projection = None
+        self.init_map(projection)
+
+    def prefetch_next_round(self):
+        # While the player answers, pick the next projection (the session
+        # has already picked the next question) and render that basemap in
+        # the background, so the next round only has to swap in a finished
+        # frame.
+        if self.game_logic.hard_mode:
+            self.next_projection = random.choice(self.projections)
+            self.renderer.prefetch(self.next_projection, True)
+
+    def show_feedback(self, answer):
+        self.renderer.clear_overlays()
 
-        self.canvas.draw()
+        color = "green" if answer.correct else "red"
+        self.renderer.show_marker(answer.lon, answer.lat, color)
+
+        if not answer.correct:
+            self.next_button.config(state=tk.NORMAL)
+            if answer.geometry:
+                self.renderer.show_item(answer.asked_item, answer.geometry, "answer")
 
-    def update_score_label(self):
-        self.score_label.config(text=f"Score: {self.game_logic.score}")
+        title = f"{answer.item} - {'Correct!' if answer.correct else 'Wrong!'}"
+        self.renderer.set_title(title)
 
     def populate_listbox(self):
         self.listbox.delete(0, tk.END)
-        items = []
-        if self.game_logic.game_mode == "countries":
-            allowed_countries = [
-                "China",
-                "Russia",
-                "US",
-                "Brazil",
-                "Egypt",
-                "Turkey",
-                "Iran",
-                "Mexico",
-                "Congo (Democratic Republic)",
-            ]
-            items = [
-                country
-                for country in self.game_logic.countries.keys()
-                if country in allowed_countries
-            ]
-        elif self.game_logic.game_mode == "rivers":
-            items = self.game_logic.rivers.keys()
-        elif self.game_logic.game_mode == "oceans":
-            items = self.game_logic.oceans.keys()
-        elif self.game_logic.game_mode == "mountains":
-            items = self.game_logic.mountains.keys()
-        elif self.game_logic.game_mode == "continents":
-            items = self.game_logic.continents.keys()
-        elif self.game_logic.game_mode == "world_blocks":
-            items = self.game_logic.world_blocks.keys()
-
-        for item in items:
+        for item in self.session.pool:
             self.listbox.insert(tk.END, item)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geografie Spel")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print per-stage startup timings and python -X importtime output",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=sorted(DEFERRED_IMPORTS),
+        default="matplotlib",
+        help="draw the map with matplotlib/cartopy, or as plain tk.Canvas "
+        "polylines for low-end machines",
+    )
+    args = parser.parse_args()
+    profile = StartupProfile(args.profile_startup)
     root = tk.Tk()
-    app = GameGUI(root)
+    app = GameGUI(root, profile, args.renderer)
     root.mainloop()
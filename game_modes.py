@@ -0,0 +1,534 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import Point, LineString
+
+from geodata import load_country_shapes
+from label_raster import LabelRaster
+
+COUNTRY_GRID_SIZE = 5
+RIVER_CLICK_TOLERANCE = 0.5
+
+# Countries that can be asked in the countries mode; every country can
+# still be clicked.
+ASKED_COUNTRIES = [
+    "China",
+    "Russia",
+    "US",
+    "Brazil",
+    "Egypt",
+    "Turkey",
+    "Iran",
+    "Mexico",
+    "Congo (Democratic Republic)",
+]
+
+# What the GUI highlights for an item: lon/lat bboxes and/or polylines.
+HintGeometry = namedtuple("HintGeometry", ["bboxes", "lines"])
+
+
+class GameMode:
+    # One entry of the GameLogic mode registry. It owns the dataset of its
+    # layer, the index used to hit-test clicks, the pool of questions and
+    # the geometry shown for hints and answers.
+    label = None
+    data_type = None
+
+    def __init__(self, data):
+        self.data = data
+        self._dataset = None
+        self._label_raster = None
+
+    @property
+    def dataset(self):
+        if self._dataset is None:
+            self.dataset = self.data.get(self.data_type)
+        return self._dataset
+
+    @dataset.setter
+    def dataset(self, dataset):
+        self._dataset = dataset
+        self._label_raster = None
+        self.build_index()
+
+    def load(self):
+        return self.dataset
+
+    def build_index(self):
+        pass
+
+    def items(self):
+        return list(self.dataset.keys())
+
+    def question_pool(self):
+        return self.items()
+
+    def hint_geometry(self, item_name):
+        return HintGeometry([self.dataset[item_name]["bbox"]], [])
+
+    def hit_test(self, lon, lat):
+        raise NotImplementedError
+
+    def hit_test_many(self, lons, lats):
+        raise NotImplementedError
+
+    def raster_key(self):
+        return ()
+
+    def label_raster(self, name):
+        if self._label_raster is None:
+            self._label_raster = LabelRaster.load_or_build(
+                name, self.items(), self.hit_test_many, key=self.raster_key()
+            )
+        return self._label_raster
+
+
+class CountriesMode(GameMode):
+    label = "Countries"
+    data_type = "landen"
+
+    def __init__(self, data, exact=False):
+        self.exact = exact
+        # Modes whose index is built from the country bboxes; they are
+        # rebuilt whenever the country data changes.
+        self.dependents = []
+        self._shapes = {}
+        super().__init__(data)
+
+    def build_index(self):
+        self.subunits = {
+            country: list(data["bbox"])
+            for country, data in self._dataset.items()
+            if "bbox" in data
+        }
+        self.bbox_list = {
+            country: [list(subunit.bbox) for subunit in subunits]
+            for country, subunits in self.subunits.items()
+        }
+        self._build_grid()
+        self._shapes = load_country_shapes(self.subunits) if self.exact else {}
+        for dependent in self.dependents:
+            if dependent._dataset is not None:
+                dependent.dataset = dependent._dataset
+
+    def _build_grid(self):
+        # Uniform grid over the subunit bboxes: every cell lists the bboxes
+        # that overlap it, so a click only checks the few boxes in its cell.
+        self._grid = {}
+        for country, bboxes in self.bbox_list.items():
+            for bbox in bboxes:
+                min_lon, min_lat, max_lon, max_lat = bbox
+                area = (max_lon - min_lon) * (max_lat - min_lat)
+                entry = (area, country, bbox)
+                min_col, min_row = _grid_cell(min_lon, min_lat)
+                max_col, max_row = _grid_cell(max_lon, max_lat)
+                for col in range(min_col, max_col + 1):
+                    for row in range(min_row, max_row + 1):
+                        self._grid.setdefault((col, row), []).append(entry)
+        for entries in self._grid.values():
+            entries.sort(key=lambda entry: entry[0])
+        self._build_grid_arrays()
+
+    def _build_grid_arrays(self):
+        # The same grid flattened into arrays for batch lookups: the entries
+        # of cell i are boxes[offsets[i]:offsets[i + 1]].
+        countries = {country: i for i, country in enumerate(self.bbox_list)}
+        cells = list(self._grid) or [(0, 0)]
+        min_col = min(col for col, row in cells)
+        min_row = min(row for col, row in cells)
+        cols = max(col for col, row in cells) - min_col + 1
+        rows = max(row for col, row in cells) - min_row + 1
+        counts = np.zeros(cols * rows + 1, dtype=np.intp)
+        boxes = []
+        box_countries = []
+        for cell in range(cols * rows):
+            row, col = divmod(cell, cols)
+            entries = self._grid.get((col + min_col, row + min_row), ())
+            counts[cell] = len(entries)
+            for area, country, bbox in entries:
+                boxes.append(bbox)
+                box_countries.append(countries[country])
+        self._grid_arrays = {
+            "min_col": min_col,
+            "min_row": min_row,
+            "cols": cols,
+            "rows": rows,
+            "offsets": np.concatenate(([0], np.cumsum(counts))),
+            "max_entries": int(counts.max()),
+            "boxes": _bbox_array(boxes),
+            "box_countries": np.array(box_countries, dtype=np.intp),
+        }
+
+    def items(self):
+        self.load()
+        return list(self.bbox_list.keys())
+
+    def question_pool(self):
+        return [country for country in self.dataset if country in ASKED_COUNTRIES]
+
+    def hint_geometry(self, item_name):
+        self.load()
+        return HintGeometry(self.bbox_list.get(item_name, []), [])
+
+    def raster_key(self):
+        return (self.exact,)
+
+    def set_exact(self, enabled):
+        # The borders are loaded here rather than in a later build_index, so
+        # a failed download reaches whoever turned exact mode on.
+        if enabled and not self._shapes:
+            self.load()
+            self._shapes = load_country_shapes(self.subunits)
+        if enabled != self.exact:
+            self._label_raster = None
+        self.exact = enabled
+
+    def candidates(self, lon, lat):
+        # Cell entries are sorted by bbox area, so nested countries come
+        # before the large boxes that surround them. Clicks outside the
+        # projection's domain come in as NaN or inf and hit nothing.
+        if not (math.isfinite(lon) and math.isfinite(lat)):
+            return []
+        candidates = []
+        for area, country, bbox in self._grid.get(_grid_cell(lon, lat), ()):
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+                if country not in candidates:
+                    candidates.append(country)
+        return candidates
+
+    def hit_test(self, lon, lat):
+        # The bbox grid is the coarse pass; in exact mode the candidates are
+        # then checked against their real borders.
+        candidates = self.candidates(lon, lat)
+        if not self.exact:
+            return candidates[0] if candidates else None
+        point = Point(lon, lat)
+        for country in candidates:
+            shape = self._shapes.get(country)
+            if shape is not None and shape.covers(point):
+                return country
+        # Countries without a Natural Earth polygon keep their bbox behaviour.
+        for country in candidates:
+            if country not in self._shapes:
+                return country
+        return None
+
+    def hit_test_many(self, lons, lats):
+        countries = list(self.bbox_list.keys())
+        if not self.exact:
+            best = self._grid_hit_test_many(lons, lats)
+            return _lookup_names(countries, np.arange(len(countries)), best)
+
+        box_countries = np.array(
+            [i for i, bboxes in enumerate(self.bbox_list.values()) for _ in bboxes],
+            dtype=np.intp,
+        )
+        bboxes = _bbox_array(
+            [bbox for bboxes in self.bbox_list.values() for bbox in bboxes]
+        )
+        areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+        contained = _bbox_contains(bboxes, lons, lats)
+
+        # Keep only the bboxes whose country polygon covers the point; the
+        # smallest of those wins, as in the single click lookup.
+        has_shape = np.zeros(len(countries), dtype=bool)
+        covered = np.zeros_like(contained)
+        for i, country in enumerate(countries):
+            shape = self._shapes.get(country)
+            if shape is None:
+                continue
+            has_shape[i] = True
+            columns = np.nonzero(box_countries == i)[0]
+            candidates = np.nonzero(contained[:, columns].any(axis=1))[0]
+            if len(candidates):
+                inside = shapely.intersects_xy(
+                    shape.context, lons[candidates], lats[candidates]
+                )
+                rows = candidates[inside]
+                covered[np.ix_(rows, columns)] = contained[np.ix_(rows, columns)]
+        best = _masked_argmin(covered, areas)
+        # Countries without a Natural Earth polygon keep their bbox behaviour.
+        fallback = _masked_argmin(contained & ~has_shape[box_countries], areas)
+        best = np.where(best >= 0, best, fallback)
+        return _lookup_names(countries, box_countries, best)
+
+    def _grid_hit_test_many(self, lons, lats):
+        grid = self._grid_arrays
+        cols = np.floor(lons / COUNTRY_GRID_SIZE) - grid["min_col"]
+        rows = np.floor(lats / COUNTRY_GRID_SIZE) - grid["min_row"]
+        valid = (
+            (cols >= 0) & (cols < grid["cols"]) & (rows >= 0) & (rows < grid["rows"])
+        )
+        # Points outside the grid go to the trailing empty cell.
+        cells = np.where(
+            valid, rows * grid["cols"] + cols, grid["cols"] * grid["rows"]
+        ).astype(np.intp)
+        starts = grid["offsets"][cells]
+        counts = grid["offsets"][cells + 1] - starts
+
+        # Cell entries are sorted by area, so the first containing entry of
+        # each point is its answer; walk the cells one slot at a time.
+        best = np.full(len(lons), -1, dtype=np.intp)
+        for slot in range(grid["max_entries"]):
+            pending = np.nonzero((best < 0) & (counts > slot))[0]
+            if not len(pending):
+                break
+            entries = starts[pending] + slot
+            inside = _bbox_contains_pairwise(
+                grid["boxes"][entries], lons[pending], lats[pending]
+            )
+            best[pending[inside]] = grid["box_countries"][entries[inside]]
+        return best
+
+
+class RiversMode(GameMode):
+    label = "Rivers"
+    data_type = "rivieren"
+
+    def build_index(self):
+        self._names = list(self._dataset.keys())
+        self._tree = STRtree(
+            [LineString(data["coordinates"]) for data in self._dataset.values()]
+        )
+
+    def hint_geometry(self, item_name):
+        return HintGeometry([], [self.dataset[item_name]["coordinates"]])
+
+    def hit_test(self, lon, lat):
+        # GEOS rejects NaN points; clicks off the map hit nothing.
+        if not (math.isfinite(lon) and math.isfinite(lat)):
+            return None
+        nearest = self._tree.query_nearest(
+            Point(lon, lat), max_distance=RIVER_CLICK_TOLERANCE
+        )
+        if len(nearest):
+            return self._names[nearest[0]]
+        return None
+
+    def hit_test_many(self, lons, lats):
+        finite = np.nonzero(np.isfinite(lons) & np.isfinite(lats))[0]
+        input_index, tree_index = self._tree.query_nearest(
+            shapely.points(lons[finite], lats[finite]),
+            max_distance=RIVER_CLICK_TOLERANCE,
+        )
+        input_index = finite[input_index]
+        result = np.full(len(lons), -1, dtype=np.intp)
+        # Equally near rivers all come back; assign in reverse so the first
+        # one wins, like in the single click lookup.
+        result[input_index[::-1]] = tree_index[::-1]
+        return _lookup_names(self._names, np.arange(len(self._names)), result)
+
+
+class BboxMode(GameMode):
+    # Items with a single bbox; the first one containing the click wins.
+    def build_index(self):
+        self._names = list(self._dataset.keys())
+        self._bboxes = _bbox_array([data["bbox"] for data in self._dataset.values()])
+
+    def hit_test(self, lon, lat):
+        for item, data in self.dataset.items():
+            min_lon, min_lat, max_lon, max_lat = data["bbox"]
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+                return item
+        return None
+
+    def hit_test_many(self, lons, lats):
+        contained = _bbox_contains(self._bboxes, lons, lats)
+        best = np.where(contained.any(axis=1), contained.argmax(axis=1), -1)
+        return _lookup_names(self._names, np.arange(len(self._names)), best)
+
+
+class MountainsMode(BboxMode):
+    label = "Mountains"
+    data_type = "bergen"
+
+
+class OceansMode(BboxMode):
+    label = "Oceans"
+    data_type = "oceanen"
+
+    def hit_test(self, lon, lat):
+        clicked_oceans = []
+        for ocean, data in self.dataset.items():
+            min_lon, min_lat, max_lon, max_lat = data["bbox"]
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+                clicked_oceans.append(ocean)
+
+        if not clicked_oceans:
+            return None
+        if len(clicked_oceans) == 1:
+            return clicked_oceans[0]
+
+        # If the click is in multiple bounding boxes, find the closest center
+        closest_ocean = None
+        min_dist = float("inf")
+        for ocean_name in clicked_oceans:
+            ocean_data = self.dataset[ocean_name]
+            center_lon = (ocean_data["bbox"][0] + ocean_data["bbox"][2]) / 2
+            center_lat = (ocean_data["bbox"][1] + ocean_data["bbox"][3]) / 2
+            dist = ((lon - center_lon) ** 2 + (lat - center_lat) ** 2) ** 0.5
+            if dist < min_dist:
+                min_dist = dist
+                closest_ocean = ocean_name
+        return closest_ocean
+
+    def hit_test_many(self, lons, lats):
+        bboxes = self._bboxes
+        contained = _bbox_contains(bboxes, lons, lats)
+        center_lons = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        center_lats = (bboxes[:, 1] + bboxes[:, 3]) / 2
+        distances = np.hypot(lons[:, None] - center_lons, lats[:, None] - center_lats)
+        best = _masked_argmin(contained, distances)
+        return _lookup_names(self._names, np.arange(len(self._names)), best)
+
+
+class RegionMode(GameMode):
+    # Groups of countries (continents, world blocks) hit-tested through
+    # their member countries' bboxes.
+    def __init__(self, data, countries):
+        self.countries = countries
+        countries.dependents.append(self)
+        super().__init__(data)
+
+    def build_index(self):
+        # Everything the lookups need, computed once: the member bboxes
+        # flattened with their region, each region's total bbox area (the
+        # tie-break), its envelope for a quick reject and the regions each
+        # country belongs to.
+        self.countries.load()
+        bbox_list = self.countries.bbox_list
+        self.bbox_list = {}
+        for region_name, country_list in self._dataset.items():
+            bboxes = []
+            for country_name in country_list:
+                if country_name in bbox_list:
+                    bboxes.extend(bbox_list[country_name])
+            if bboxes:
+                self.bbox_list[region_name] = bboxes
+
+        self._names = list(self.bbox_list.keys())
+        self._box_regions = np.array(
+            [i for i, bboxes in enumerate(self.bbox_list.values()) for _ in bboxes],
+            dtype=np.intp,
+        )
+        boxes = _bbox_array(
+            [bbox for bboxes in self.bbox_list.values() for bbox in bboxes]
+        )
+        self._boxes = boxes
+        self._starts = np.searchsorted(self._box_regions, np.arange(len(self._names)))
+        self._areas = np.bincount(
+            self._box_regions,
+            weights=(boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]),
+            minlength=len(self._names),
+        )
+        self._envelopes = _bbox_array(
+            [
+                [
+                    min(bbox[0] for bbox in bboxes),
+                    min(bbox[1] for bbox in bboxes),
+                    max(bbox[2] for bbox in bboxes),
+                    max(bbox[3] for bbox in bboxes),
+                ]
+                for bboxes in self.bbox_list.values()
+            ]
+        )
+        self._country_regions = {}
+        for i, name in enumerate(self._names):
+            for country in self._dataset[name]:
+                self._country_regions.setdefault(country, []).append(i)
+
+    def items(self):
+        self.load()
+        return list(self._names)
+
+    def question_pool(self):
+        return list(self.dataset.keys())
+
+    def hint_geometry(self, item_name):
+        self.load()
+        return HintGeometry(self.bbox_list.get(item_name, []), [])
+
+    def hit_test(self, lon, lat):
+        # Region bboxes are their countries' bboxes, so the country grid
+        # already knows which regions contain the click.
+        best = None
+        for country in self.countries.candidates(lon, lat):
+            for region in self._country_regions.get(country, ()):
+                if best is None or self._areas[region] < self._areas[best]:
+                    best = region
+        return None if best is None else self._names[best]
+
+    def hit_test_many(self, lons, lats):
+        best = np.full(len(lons), -1, dtype=np.intp)
+        # Points outside every region envelope cannot hit anything.
+        near = np.nonzero(_bbox_contains(self._envelopes, lons, lats).any(axis=1))[0]
+        if len(near):
+            contained = _bbox_contains(self._boxes, lons[near], lats[near])
+            # A region is hit when any of its (contiguous) bboxes contains the
+            # point; the smallest total area wins.
+            region_hit = np.logical_or.reduceat(contained, self._starts, axis=1)
+            best[near] = _masked_argmin(region_hit, self._areas)
+        return _lookup_names(self._names, np.arange(len(self._names)), best)
+
+
+class ContinentsMode(RegionMode):
+    label = "Continents"
+    data_type = "continenten"
+
+
+class WorldBlocksMode(RegionMode):
+    label = "World Blocks"
+    data_type = "wereldblokken"
+
+
+def default_modes(data, exact_countries=False):
+    countries = CountriesMode(data, exact=exact_countries)
+    return {
+        "countries": countries,
+        "rivers": RiversMode(data),
+        "oceans": OceansMode(data),
+        "mountains": MountainsMode(data),
+        "continents": ContinentsMode(data, countries),
+        "world_blocks": WorldBlocksMode(data, countries),
+    }
+
+
+def _grid_cell(lon, lat):
+    return (
+        math.floor(lon / COUNTRY_GRID_SIZE),
+        math.floor(lat / COUNTRY_GRID_SIZE),
+    )
+
+
+def _bbox_array(bboxes):
+    return np.asarray(bboxes, dtype=float).reshape(-1, 4)
+
+
+def _bbox_contains(bboxes, lons, lats):
+    # points x bboxes containment matrix
+    return _bbox_contains_pairwise(bboxes, lons[:, None], lats[:, None])
+
+
+def _bbox_contains_pairwise(bboxes, lons, lats):
+    return (
+        (bboxes[:, 0] <= lons)
+        & (lons <= bboxes[:, 2])
+        & (bboxes[:, 1] <= lats)
+        & (lats <= bboxes[:, 3])
+    )
+
+
+def _masked_argmin(mask, values):
+    # Index of the smallest value where mask is set, -1 for rows without any.
+    masked = np.where(mask, values, np.inf)
+    return np.where(mask.any(axis=1), masked.argmin(axis=1), -1)
+
+
+def _lookup_names(names, index_to_name, indices):
+    # indices of -1 map onto the trailing None.
+    lookup = np.array(list(names) + [None], dtype=object)
+    return lookup[np.append(index_to_name, -1)[indices]]
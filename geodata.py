@@ -0,0 +1,48 @@
+import functools
+
+COUNTRY_SHAPES_RESOLUTION = "50m"
+
+
+@functools.lru_cache(maxsize=None)
+def country_subunits(iso_code):
+    # country_subunits_by_iso_code hands out a one-shot iterator; keep a
+    # tuple so every caller can iterate the same subunit objects.
+    from country_bounding_boxes import country_subunits_by_iso_code
+
+    return tuple(country_subunits_by_iso_code(iso_code))
+
+
+@functools.lru_cache(maxsize=None)
+def _natural_earth_countries(resolution):
+    import cartopy.io.shapereader as shapereader
+
+    path = shapereader.natural_earth(
+        resolution=resolution, category="cultural", name="admin_0_countries"
+    )
+    geometries = {}
+    for record in shapereader.Reader(path).records():
+        geometries.setdefault(record.attributes["ADM0_A3"], []).append(record.geometry)
+    return geometries
+
+
+def fetch_country_shapes(resolution=COUNTRY_SHAPES_RESOLUTION):
+    # The slow part of load_country_shapes (the download, the first time,
+    # and reading the shapefile); touches nothing else, so it can run on a
+    # background thread.
+    _natural_earth_countries(resolution)
+
+
+def load_country_shapes(subunits_by_country, resolution=COUNTRY_SHAPES_RESOLUTION):
+    # Natural Earth country polygons matched to our countries through the
+    # ADM0 code of their subunits, prepared for fast repeated point tests.
+    from shapely.ops import unary_union
+    from shapely.prepared import prep
+
+    geometries = _natural_earth_countries(resolution)
+    shapes = {}
+    for country, subunits in subunits_by_country.items():
+        codes = {subunit.adm0_a3 for subunit in subunits}
+        parts = [geometry for code in codes for geometry in geometries.get(code, ())]
+        if parts:
+            shapes[country] = prep(unary_union(parts))
+    return shapes
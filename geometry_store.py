@@ -0,0 +1,113 @@
+import cartopy.crs as ccrs
+import numpy as np
+from pyproj import Geod
+
+# Geodesic spacing of densified line vertices, in metres.
+DENSIFY_SPACING = 20000
+
+# A step between consecutive vertices longer than this fraction of the
+# projection's width crosses a cut (antimeridian, Goode interruption) and
+# splits the line.
+MAX_STEP_FRACTION = 0.05
+
+# Vertices per edge of a lon/lat box outline.
+BBOX_EDGE_POINTS = 32
+
+
+class GeometryStore:
+    # Lines given as lon/lat vertices (rivers, river hints and answers) are
+    # densified along the WGS84 geodesic once, and the densified vertices are
+    # projected once per projection. After that a line on any map seen
+    # before is a dictionary lookup instead of cartopy re-interpolating
+    # every great-circle segment on every draw.
+    def __init__(self, spacing=DENSIFY_SPACING):
+        self.spacing = spacing
+        self.geod = Geod(ellps="WGS84")
+        self.densified = {}
+        self.projected = {}
+        self.boxes = {}
+
+    def densify(self, coordinates):
+        key = _line_key(coordinates)
+        vertices = self.densified.get(key)
+        if vertices is None:
+            points = [key[0]]
+            for (lon1, lat1), (lon2, lat2) in zip(key[:-1], key[1:]):
+                _, _, distance = self.geod.inv(lon1, lat1, lon2, lat2)
+                count = int(distance // self.spacing)
+                if count:
+                    points.extend(self.geod.npts(lon1, lat1, lon2, lat2, count))
+                points.append((lon2, lat2))
+            vertices = np.array(points, dtype=float)
+            self.densified[key] = vertices
+        return vertices
+
+    def project(self, coordinates, projection):
+        key = (_line_key(coordinates), projection)
+        segments = self.projected.get(key)
+        if segments is None:
+            vertices = self.densify(coordinates)
+            points = projection.transform_points(
+                ccrs.Geodetic(), vertices[:, 0], vertices[:, 1]
+            )[:, :2]
+            width = projection.x_limits[1] - projection.x_limits[0]
+            segments = _split(points, width * MAX_STEP_FRACTION)
+            self.projected[key] = segments
+        return segments
+
+    def project_many(self, lines, projection):
+        segments = []
+        for coordinates in lines:
+            segments.extend(self.project(coordinates, projection))
+        return segments
+
+    def project_bbox(self, bbox, projection):
+        # The outline of a lon/lat box, with its edges following lines of
+        # constant longitude and latitude like a PlateCarree rectangle.
+        key = (tuple(float(value) for value in bbox), projection)
+        segments = self.boxes.get(key)
+        if segments is None:
+            min_lon, min_lat, max_lon, max_lat = key[0]
+            steps = np.linspace(0, 1, BBOX_EDGE_POINTS, endpoint=False)
+            lons = np.concatenate(
+                [
+                    min_lon + (max_lon - min_lon) * steps,
+                    np.full(BBOX_EDGE_POINTS, max_lon),
+                    max_lon - (max_lon - min_lon) * steps,
+                    np.full(BBOX_EDGE_POINTS, min_lon),
+                    [min_lon],
+                ]
+            )
+            lats = np.concatenate(
+                [
+                    np.full(BBOX_EDGE_POINTS, min_lat),
+                    min_lat + (max_lat - min_lat) * steps,
+                    np.full(BBOX_EDGE_POINTS, max_lat),
+                    max_lat - (max_lat - min_lat) * steps,
+                    [min_lat],
+                ]
+            )
+            points = projection.transform_points(ccrs.PlateCarree(), lons, lats)[:, :2]
+            width = projection.x_limits[1] - projection.x_limits[0]
+            segments = _split(points, width * MAX_STEP_FRACTION)
+            self.boxes[key] = segments
+        return segments
+
+
+def _line_key(coordinates):
+    return tuple((float(lon), float(lat)) for lon, lat in coordinates)
+
+
+def _split(points, max_step):
+    # Drop vertices the projection cannot show (e.g. the far side of a
+    # NearsidePerspective globe) and break the line wherever it does so or
+    # jumps across a cut.
+    finite = np.isfinite(points).all(axis=1)
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    breaks = ~finite[:-1] | ~finite[1:] | ~(steps <= max_step)
+    segments = []
+    for part in np.split(np.arange(len(points)), np.flatnonzero(breaks) + 1):
+        part = part[finite[part]]
+        if len(part) > 1:
+            segments.append(points[part])
+    return segments
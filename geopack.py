@@ -0,0 +1,324 @@
+import argparse
+import importlib.util
+import json
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from data_registry import DataRegistry
+from disk_cache import cache_path, file_digest
+
+PACK_MAGIC = b"GEOPACK\0"
+PACK_VERSION = 1
+PACK_PATH = cache_path("geo.pack")
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.py")
+ALIGNMENT = 8
+
+# Stand-in for the country_bounding_boxes subunit records: the game only
+# needs the bbox and the ADM0 code.
+Subunit = namedtuple("Subunit", ["bbox", "adm0_a3"])
+
+BBOX_TYPES = ["oceanen", "bergen"]
+REGION_TYPES = ["continenten", "wereldblokken"]
+
+
+def source_digests():
+    # Hashed without importing anything, so checking a pack stays cheap.
+    # A source that cannot be found (e.g. in a frozen build) is not checked.
+    digests = {}
+    if os.path.exists(DATA_PATH):
+        digests["data"] = file_digest(DATA_PATH, extra=(PACK_VERSION,))
+    spec = importlib.util.find_spec("country_bounding_boxes")
+    if spec is not None and spec.submodule_search_locations:
+        package_dir = list(spec.submodule_search_locations)[0]
+        digests["subunits"] = file_digest(
+            os.path.join(package_dir, "__init__.py"),
+            os.path.join(package_dir, "generated.py"),
+        )
+    return digests
+
+
+class _PackWriter:
+    def __init__(self):
+        self.strings = {}
+        self.arrays = {}
+
+    def string(self, value):
+        return self.strings.setdefault(value, len(self.strings))
+
+    def add(self, name, array):
+        self.arrays[name] = np.ascontiguousarray(array)
+
+    def add_strings(self, name, values):
+        self.add(name, np.array([self.string(value) for value in values], np.int32))
+
+    def add_ragged(self, name, rows, dtype, width=None):
+        # Flat values plus an offsets array: row i is values[offsets[i]:offsets[i + 1]].
+        lengths = [len(row) for row in rows]
+        flat = [value for row in rows for value in row]
+        shape = (len(flat), width) if width else (len(flat),)
+        self.add(f"{name}.values", np.array(flat, dtype=dtype).reshape(shape))
+        self.add(
+            f"{name}.offsets",
+            np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+        )
+
+    def write(self, path, digests):
+        encoded = [value.encode("utf-8") for value in self.strings]
+        self.add(
+            "strings.offsets",
+            np.cumsum([0] + [len(s) for s in encoded]).astype(np.int64),
+        )
+        self.add("strings.bytes", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+        layout = {}
+        offset = 0
+        for name, array in self.arrays.items():
+            layout[name] = {
+                "offset": offset,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+            offset += _aligned(array.nbytes)
+        header = json.dumps(
+            {"version": PACK_VERSION, "digests": digests, "arrays": layout}
+        ).encode("utf-8")
+        header += b" " * (_aligned(len(header)) - len(header))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(PACK_MAGIC)
+            f.write(struct.pack("<II", PACK_VERSION, len(header)))
+            f.write(header)
+            for array in self.arrays.values():
+                f.write(array.tobytes())
+                f.write(b"\0" * (_aligned(array.nbytes) - array.nbytes))
+        os.replace(tmp_path, path)
+
+
+def _aligned(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def compile_pack(path=PACK_PATH):
+    # The only place that needs data.py and country_bounding_boxes.
+    import data
+
+    writer = _PackWriter()
+    countries = data.Data.get("countries_iso")
+    writer.add_strings("countries.names", countries)
+    writer.add_strings(
+        "countries.iso_codes", [country["iso_code"] for country in countries.values()]
+    )
+    subunits = [country["bbox"] for country in countries.values()]
+    writer.add_ragged(
+        "countries.bboxes",
+        [[subunit.bbox for subunit in row] for row in subunits],
+        np.float64,
+        width=4,
+    )
+    writer.add_ragged(
+        "countries.adm0",
+        [[writer.string(subunit.adm0_a3) for subunit in row] for row in subunits],
+        np.int32,
+    )
+
+    rivers = data.Data.get("rivieren")
+    writer.add_strings("rivieren.names", rivers)
+    writer.add_ragged(
+        "rivieren.vertices",
+        [river["coordinates"] for river in rivers.values()],
+        np.float64,
+        width=2,
+    )
+
+    cities = data.Data.get("cities")
+    writer.add_strings("cities.names", cities)
+    writer.add(
+        "cities.coordinates",
+        np.array(
+            [[city["latitude"], city["longitude"]] for city in cities.values()],
+            dtype=np.float64,
+        ).reshape(-1, 2),
+    )
+
+    for data_type in BBOX_TYPES:
+        items = data.Data.get(data_type)
+        writer.add_strings(f"{data_type}.names", items)
+        writer.add(
+            f"{data_type}.bboxes",
+            np.array(
+                [item["bbox"] for item in items.values()], dtype=np.float64
+            ).reshape(-1, 4),
+        )
+
+    for data_type in REGION_TYPES:
+        regions = data.Data.get(data_type)
+        writer.add_strings(f"{data_type}.names", regions)
+        writer.add_ragged(
+            f"{data_type}.members",
+            [
+                [writer.string(member) for member in members]
+                for members in regions.values()
+            ],
+            np.int32,
+        )
+
+    writer.write(path, source_digests())
+
+
+class GeoPack:
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                raise ValueError(f"{path} is not a geo pack")
+            prefix = f.read(8)
+            if len(prefix) != 8:
+                raise ValueError(f"{path} is truncated")
+            version, header_len = struct.unpack("<II", prefix)
+            if version != PACK_VERSION:
+                raise ValueError(f"{path} has pack version {version}")
+            header = json.loads(f.read(header_len))
+        self.digests = header["digests"]
+        base = len(PACK_MAGIC) + 8 + header_len
+        self._memmap = np.memmap(path, dtype=np.uint8, mode="r")
+        self.arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            start = base + entry["offset"]
+            self.arrays[name] = (
+                self._memmap[start : start + count * dtype.itemsize]
+                .view(dtype)
+                .reshape(entry["shape"])
+            )
+        blob = self.arrays["strings.bytes"].tobytes()
+        offsets = self.arrays["strings.offsets"]
+        self.strings = [
+            blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
+
+    def is_current(self):
+        current = source_digests()
+        return all(self.digests.get(key) == value for key, value in current.items())
+
+    def names(self, data_type):
+        return [self.strings[i] for i in self.arrays[f"{data_type}.names"]]
+
+    def ragged(self, name):
+        values = self.arrays[f"{name}.values"]
+        offsets = self.arrays[f"{name}.offsets"]
+        return [values[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    def registry(self):
+        return DataRegistry(
+            {
+                "cities": self._load_cities,
+                "rivieren": self._load_rivieren,
+                "oceanen": lambda: self._load_bboxes("oceanen"),
+                "bergen": lambda: self._load_bboxes("bergen"),
+                "landen": self._load_landen,
+                "countries_iso": self._load_countries_iso,
+                "continenten": lambda: self._load_regions("continenten"),
+                "wereldblokken": lambda: self._load_regions("wereldblokken"),
+            }
+        )
+
+    def _country_subunits(self):
+        if not hasattr(self, "_subunits"):
+            self._subunits = [
+                tuple(
+                    Subunit(tuple(bbox.tolist()), self.strings[adm0])
+                    for bbox, adm0 in zip(bboxes, codes)
+                )
+                for bboxes, codes in zip(
+                    self.ragged("countries.bboxes"), self.ragged("countries.adm0")
+                )
+            ]
+        return self._subunits
+
+    def _load_cities(self):
+        return {
+            name: {"latitude": float(lat), "longitude": float(lon)}
+            for name, (lat, lon) in zip(
+                self.names("cities"), self.arrays["cities.coordinates"]
+            )
+        }
+
+    def _load_rivieren(self):
+        return {
+            name: {"coordinates": [tuple(vertex) for vertex in vertices.tolist()]}
+            for name, vertices in zip(
+                self.names("rivieren"), self.ragged("rivieren.vertices")
+            )
+        }
+
+    def _load_bboxes(self, data_type):
+        return {
+            name: {"bbox": bbox}
+            for name, bbox in zip(
+                self.names(data_type), self.arrays[f"{data_type}.bboxes"].tolist()
+            )
+        }
+
+    def _load_landen(self):
+        return {
+            name: {"bbox": subunits}
+            for name, subunits in zip(self.names("countries"), self._country_subunits())
+            if subunits
+        }
+
+    def _load_countries_iso(self):
+        return {
+            name: {"iso_code": self.strings[code], "bbox": subunits}
+            for name, code, subunits in zip(
+                self.names("countries"),
+                self.arrays["countries.iso_codes"],
+                self._country_subunits(),
+            )
+            if subunits
+        }
+
+    def _load_regions(self, data_type):
+        return {
+            name: [self.strings[member] for member in members]
+            for name, members in zip(
+                self.names(data_type), self.ragged(f"{data_type}.members")
+            )
+        }
+
+
+def load_data(path=PACK_PATH):
+    # Data registry backed by the pack, (re)compiled first when it is
+    # missing or older than its sources.
+    try:
+        pack = GeoPack(path)
+        if pack.is_current():
+            return pack.registry()
+        # Windows cannot replace a file that is still mapped, so let go of
+        # the stale pack (and with it its memmap) before compiling over it.
+        del pack
+    except (OSError, ValueError):
+        pass
+    compile_pack(path)
+    return GeoPack(path).registry()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the geography pack.")
+    parser.add_argument("--output", default=PACK_PATH)
+    args = parser.parse_args()
+    compile_pack(args.output)
+    pack = GeoPack(args.output)
+    print(
+        f"{args.output}: {os.path.getsize(args.output)} bytes, "
+        f"{len(pack.strings)} strings, {len(pack.arrays)} arrays"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+
+from disk_cache import cache_path, save_array, source_digest
+
+# Stop halving once the next level would be narrower than this.
+MIN_LEVEL_WIDTH = 256
+
+
+def _level_path(prefix, index):
+    return cache_path("pyramid", f"{prefix}{index}.npy")
+
+
+class ImagePyramid:
+    # Successive 2x box-filtered halvings of an RGB image, level 0 being the
+    # original. Levels are kept as memory-mapped uint8 .npy files, so only
+    # the pages of the level actually drawn become resident.
+    def __init__(self, levels):
+        self.levels = levels
+
+    @staticmethod
+    def build_levels(image):
+        levels = [np.ascontiguousarray(image, dtype=np.uint8)]
+        while levels[-1].shape[1] // 2 >= MIN_LEVEL_WIDTH:
+            level = levels[-1]
+            rows, cols = level.shape[0] // 2 * 2, level.shape[1] // 2 * 2
+            blocks = level[:rows, :cols].reshape(rows // 2, 2, cols // 2, 2, -1)
+            summed = blocks.sum(axis=(1, 3), dtype=np.uint16)
+            levels.append(((summed + 2) // 4).astype(np.uint8))
+        return levels
+
+    @classmethod
+    def load_or_build(cls, path):
+        # Cached per source image; the file names carry a digest of it, so a
+        # new image replaces the old pyramid.
+        name = os.path.splitext(os.path.basename(path))[0]
+        prefix = f"{name}-{source_digest(path)}-"
+
+        levels = []
+        while os.path.exists(_level_path(prefix, len(levels))):
+            levels.append(np.load(_level_path(prefix, len(levels)), mmap_mode="r"))
+        if levels and levels[-1].shape[1] // 2 < MIN_LEVEL_WIDTH:
+            return cls(levels)
+
+        import matplotlib.pyplot as plt
+
+        levels = []
+        for index, level in enumerate(cls.build_levels(plt.imread(path))):
+            save_array(_level_path(prefix, index), level)
+            levels.append(np.load(_level_path(prefix, index), mmap_mode="r"))
+        directory = os.path.dirname(_level_path(prefix, 0))
+        for stale in os.listdir(directory):
+            if stale.startswith(f"{name}-") and not stale.startswith(prefix):
+                try:
+                    os.remove(os.path.join(directory, stale))
+                except OSError:
+                    pass
+        return cls(levels)
+
+    def level_for(self, width, height):
+        # The smallest level that still has at least one image pixel per
+        # screen pixel in both directions.
+        for level in reversed(self.levels):
+            if level.shape[1] >= width and level.shape[0] >= height:
+                return level
+        return self.levels[0]
@@ -1,2 +1,2 @@
 #!/bin/bash
-pip3 install country_bounding_boxes matplotlib cartopy shapely
\ No newline at end of file
+pip3 install country_bounding_boxes matplotlib cartopy shapely numpy pykdtree
\ No newline at end of file
@@ -0,0 +1,84 @@
+import math
+import os
+
+import numpy as np
+
+from disk_cache import cache_path, file_digest, remove_stale, save_array
+from geopack import source_digests
+
+RASTER_RESOLUTION = 0.1
+NO_LABEL = np.iinfo(np.uint16).max
+
+
+class LabelRaster:
+    # Winning item per lon/lat cell for one game mode, so resolving a click
+    # is a single array index. Cells hold indices into names, NO_LABEL where
+    # nothing is hit.
+    def __init__(self, labels, names, resolution):
+        self.labels = labels
+        self.names = names
+        self.resolution = resolution
+        self._lookup = np.array(list(names) + [None], dtype=object)
+
+    @classmethod
+    def build(cls, hit_test_many, names, resolution=RASTER_RESOLUTION):
+        # Sample every cell centre with the batch hit-test, so the raster
+        # follows the same tie-break rules as a real click.
+        rows = int(round(180 / resolution))
+        cols = int(round(360 / resolution))
+        lats = -90 + (np.arange(rows) + 0.5) * resolution
+        lons = -180 + (np.arange(cols) + 0.5) * resolution
+        index = {name: i for i, name in enumerate(names)}
+        index[None] = NO_LABEL
+        labels = np.empty((rows, cols), dtype=np.uint16)
+        for row, lat in enumerate(lats):
+            items = hit_test_many(lons, np.full_like(lons, lat))
+            labels[row] = [index[item] for item in items]
+        return cls(labels, names, resolution)
+
+    @classmethod
+    def load_or_build(
+        cls, mode, names, hit_test_many, key=(), resolution=RASTER_RESOLUTION
+    ):
+        # Cached per mode; the digest covers the sources the geo pack is
+        # compiled from, the item list and the mode's own settings (key), so
+        # edits to the data rebuild the raster.
+        digest = file_digest(
+            extra=(mode, resolution, *key, *names, *sorted(source_digests().items()))
+        )
+        prefix = f"{mode}-{resolution}-"
+        path = cache_path("labels", f"{prefix}{digest}.npy")
+        if os.path.exists(path):
+            return cls(np.load(path, mmap_mode="r"), names, resolution)
+        raster = cls.build(hit_test_many, names, resolution)
+        save_array(path, raster.labels)
+        remove_stale(os.path.dirname(path), prefix, os.path.basename(path))
+        return raster
+
+    def lookup(self, lon, lat):
+        if not (math.isfinite(lon) and math.isfinite(lat)):
+            return None
+        rows, cols = self.labels.shape
+        row = min(max(int((lat + 90) / self.resolution), 0), rows - 1)
+        col = min(max(int((lon + 180) / self.resolution), 0), cols - 1)
+        label = self.labels[row, col]
+        return None if label == NO_LABEL else self.names[label]
+
+    def lookup_many(self, lons, lats):
+        rows, cols = self.labels.shape
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        finite = np.isfinite(lons) & np.isfinite(lats)
+        row = np.clip(
+            ((np.where(finite, lats, 0) + 90) / self.resolution).astype(np.intp),
+            0,
+            rows - 1,
+        )
+        col = np.clip(
+            ((np.where(finite, lons, 0) + 180) / self.resolution).astype(np.intp),
+            0,
+            cols - 1,
+        )
+        labels = self.labels[row, col].astype(np.intp)
+        labels[(labels == NO_LABEL) | ~finite] = -1
+        return self._lookup[labels]
@@ -0,0 +1,420 @@
+import cartopy.crs as ccrs
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+
+from basemap_cache import BASEMAP_CACHE_BYTES, BasemapCache
+from etopo_cache import SOURCE_EXTENT, load_or_warp
+from feature_cache import FeatureCache
+from geometry_store import GeometryStore
+from image_pyramid import ImagePyramid
+
+DEFAULT_TITLE = "Geografie Spel"
+RENDERING_TEXT = "rendering…"
+FAILED_TEXT = "The map could not be drawn:\n{error}"
+
+# (bbox style, line style) for an item's highlight.
+HIGHLIGHT_STYLES = {
+    "hint": (
+        dict(facecolor="yellow", edgecolor="yellow", linewidth=1, alpha=0.5),
+        dict(color="yellow", linewidth=10, alpha=0.5),
+    ),
+    "answer": (
+        dict(facecolor="none", edgecolor="green", linewidth=2, alpha=None),
+        dict(color="green", linewidth=2, alpha=None),
+    ),
+}
+
+
+class BasemapArtist(Artist):
+    # Pastes a pre-rendered frame at the figure origin as-is. Unlike
+    # figimage there is no resampling or masking, so a full redraw costs
+    # little more than a memcpy.
+    def __init__(self, frame):
+        super().__init__()
+        self.frame = frame
+        self.set_zorder(-1)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, 0, 0, self.frame)
+        gc.restore()
+
+
+class MapRenderer:
+    # The static basemap (etopo or land/ocean, Natural Earth features and the
+    # game rivers, with the Natural Earth layers taken pre-projected from a
+    # FeatureCache) is rendered offscreen once per projection and canvas size
+    # and kept in an LRU cache. On screen it is pasted in as a figure artist
+    # behind a transparent GeoAxes that only holds the animated overlays
+    # (click markers, hints, feedback and the title), which are blitted on
+    # top of the captured background. With a RenderWorker, basemaps that are
+    # not cached yet are rendered off the Tk thread.
+    def __init__(
+        self,
+        figure,
+        canvas,
+        image_path,
+        cache_bytes=BASEMAP_CACHE_BYTES,
+        worker=None,
+    ):
+        self.figure = figure
+        self.canvas = canvas
+        self.worker = worker
+        self.image_path = image_path
+        self._pyramid = None
+        self.basemaps = BasemapCache(cache_bytes)
+        self.features = FeatureCache()
+        self.geometry = GeometryStore()
+        self.ax = None
+        self.projection = None
+        self.hard_mode = False
+        self.rivers = {}
+        self.basemap_image = None
+        self.status = None
+        self.prefetch_key = None
+        self.queued_prefetch = None
+        self.background = None
+        self.overlays = []
+        self.marker = None
+        self.item_overlays = {}
+        self.saving = False
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", self._on_resize)
+
+    @property
+    def pyramid(self):
+        if self._pyramid is None:
+            self._pyramid = ImagePyramid.load_or_build(self.image_path)
+        return self._pyramid
+
+    def set_projection(self, projection, hard_mode, rivers):
+        self.projection = projection
+        self.hard_mode = hard_mode
+        self.rivers = rivers or {}
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(1, 1, 1, projection=projection)
+        # The basemap frame already has the background and map outline.
+        self.ax.patch.set_visible(False)
+        self.ax.spines["geo"].set_visible(False)
+        self.ax.set_global()
+        self.ax.title.set_animated(True)
+        self.ax.set_title(DEFAULT_TITLE)
+        self.overlays = []
+        self.marker = None
+        self.item_overlays = {}
+        self.basemap_image = None
+        self.status = self.figure.text(
+            0.5, 0.5, RENDERING_TEXT, ha="center", va="center", visible=False
+        )
+        self.status.set_animated(True)
+        self._show_basemap()
+        self.background = None
+        # A full draw; _on_draw then grabs the background.
+        self.canvas.draw()
+
+    def basemap_key(self):
+        width, height = self.figure.canvas.get_width_height(physical=True)
+        return (self.projection, self.hard_mode, width, height, self.figure.dpi)
+
+    def _show_basemap(self):
+        key = self.basemap_key()
+        frame = self.basemaps.get(key)
+        if frame is None and self.worker is not None:
+            # Keep the event loop running; the frame is swapped in when the
+            # worker has it, unless the map has moved on by then.
+            self._set_frame(None)
+            self.status.set_text(RENDERING_TEXT)
+            self.status.set_visible(True)
+            self.queued_prefetch = None
+            if self.prefetch_key == key and self.worker.busy:
+                self.worker.adopt(
+                    lambda frame: self._frame_ready(key, frame),
+                    lambda error: self._frame_failed(key, error),
+                )
+            else:
+                rivers = self.rivers
+                self.worker.submit(
+                    lambda: self.render_basemap(*key, rivers),
+                    lambda frame: self._frame_ready(key, frame),
+                    lambda error: self._frame_failed(key, error),
+                )
+            self.prefetch_key = None
+            return
+        if self.worker is not None and self.prefetch_key is None:
+            # Drops a frame the player no longer waits for, and with it
+            # the prefetch queued behind it, so start that now.
+            self.worker.cancel()
+            self._start_queued_prefetch()
+        if frame is None:
+            frame = self.render_basemap(*key, self.rivers)
+            self.basemaps.put(key, frame)
+        self._set_frame(frame)
+
+    def _frame_ready(self, key, frame):
+        self.basemaps.put(key, frame)
+        self._start_queued_prefetch()
+        if key != self.basemap_key():
+            return
+        self.status.set_visible(False)
+        self._set_frame(frame)
+        self.canvas.draw_idle()
+
+    def _frame_failed(self, key, error):
+        # Nothing to show; say so instead of "rendering…". The next
+        # projection change tries again.
+        self._start_queued_prefetch()
+        if key != self.basemap_key():
+            return
+        self.status.set_text(FAILED_TEXT.format(error=error))
+        self.blit()
+
+    def prefetch(self, projection, hard_mode):
+        # Render a basemap that will probably be needed next into the cache,
+        # without touching what is on screen. Never interrupts a frame the
+        # player is waiting for; it is queued behind it instead.
+        width, height = self.figure.canvas.get_width_height(physical=True)
+        key = (projection, hard_mode, width, height, self.figure.dpi)
+        if self.worker is None or key in self.basemaps or key == self.prefetch_key:
+            return
+        if self.worker.busy:
+            self.queued_prefetch = key
+            return
+        self._start_prefetch(key)
+
+    def _start_queued_prefetch(self):
+        key = self.queued_prefetch
+        self.queued_prefetch = None
+        if key is not None and key not in self.basemaps and not self.worker.busy:
+            self._start_prefetch(key)
+
+    def _start_prefetch(self, key):
+        self.queued_prefetch = None
+        self.prefetch_key = key
+        rivers = self.rivers
+        self.worker.submit(
+            lambda: self.render_basemap(*key, rivers),
+            lambda frame: self._prefetched(key, frame),
+            lambda error: self._prefetch_failed(key),
+        )
+
+    def _prefetched(self, key, frame):
+        self.prefetch_key = None
+        self.basemaps.put(key, frame)
+        self._start_queued_prefetch()
+
+    def _prefetch_failed(self, key):
+        # The round change renders it in the foreground and reports the
+        # error then.
+        self.prefetch_key = None
+        self._start_queued_prefetch()
+
+    def _set_frame(self, frame):
+        if self.basemap_image is not None:
+            self.basemap_image.remove()
+            self.basemap_image = None
+        if frame is not None:
+            self.basemap_image = self.figure.add_artist(BasemapArtist(frame))
+
+    @property
+    def rendering(self):
+        return self.worker is not None and self.worker.busy
+
+    def render_basemap(self, projection, hard_mode, width, height, dpi, rivers):
+        # Same size, dpi and subplot layout as the on-screen figure, so the
+        # frame lines up pixel for pixel with the overlay axes. Only touches
+        # its own figure and what it is given, so it can run on the render
+        # worker's thread.
+        figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_subplot(1, 1, 1, projection=projection)
+        self._draw_basemap(ax, hard_mode, rivers)
+        canvas.draw()
+        # Renderers expect image rows bottom-up.
+        return np.ascontiguousarray(np.asarray(canvas.buffer_rgba())[::-1])
+
+    def _draw_basemap(self, ax, hard_mode, rivers):
+        if not hard_mode:
+            self._draw_etopo(ax)
+            names = ["coastline", "borders", "lakes", "rivers"]
+        else:
+            names = ["land", "ocean", "coastline", "borders", "lakes", "rivers"]
+        for name in names:
+            ax.add_collection(
+                self.features.collection(name, ax.projection, ax), autolim=False
+            )
+        ax.set_global()
+
+        # Styled like the Line2D per river this used to be.
+        ax.add_collection(
+            LineCollection(
+                self.geometry.project_many(
+                    (data["coordinates"] for data in rivers.values()),
+                    ax.projection,
+                ),
+                colors="blue",
+                linewidths=2,
+                capstyle="projecting",
+                joinstyle="round",
+                zorder=2,
+                transform=ax.transData,
+            ),
+            autolim=False,
+        )
+
+    def _bbox_paths(self, bboxes):
+        # The projected outline of each lon/lat box, as cartopy would work
+        # it out for a PlateCarree Rectangle on every draw.
+        to_map = ccrs.PlateCarree()._as_mpl_transform(self.ax)
+        paths = []
+        for min_lon, min_lat, max_lon, max_lat in bboxes:
+            rectangle = Rectangle(
+                (min_lon, min_lat), max_lon - min_lon, max_lat - min_lat
+            )
+            path = rectangle.get_patch_transform().transform_path(rectangle.get_path())
+            paths.append(to_map.transform_path_non_affine(path))
+        return paths
+
+    def _draw_etopo(self, ax):
+        if ax.projection == ccrs.PlateCarree():
+            # Only as much of the pyramid as the axes has device pixels for.
+            ax.set_global()
+            ax.apply_aspect()
+            ax.imshow(
+                self.pyramid.level_for(ax.bbox.width, ax.bbox.height),
+                origin="upper",
+                extent=SOURCE_EXTENT,
+                transform=ccrs.PlateCarree(),
+            )
+            return
+        # Any other projection would make cartopy regrid the full image on
+        # every render; use the pre-warped copy from the disk cache instead.
+        warped, extent = load_or_warp(
+            self.image_path, ax.projection, image=self.pyramid.levels[0]
+        )
+        ax.imshow(warped, origin="lower", extent=extent, transform=ax.projection)
+
+    def connect_clicks(self, on_click):
+        # Reports every click on the current axes as on_click(ax, lon, lat).
+        def on_press(event):
+            if self.ax is None or event.inaxes is not self.ax:
+                return
+            lon, lat = ccrs.PlateCarree().transform_point(
+                event.xdata, event.ydata, self.ax.projection
+            )
+            # Outside the projection's domain, e.g. the corners around the
+            # NearsidePerspective globe.
+            if np.isfinite(lon) and np.isfinite(lat):
+                on_click(self.ax, lon, lat)
+
+        return self.canvas.mpl_connect("button_press_event", on_press)
+
+    def _on_resize(self, event):
+        # The canvas redraws right after resizing; swap in a frame that
+        # matches the new size before it does.
+        if self.ax is not None:
+            self._show_basemap()
+
+    def _on_draw(self, event):
+        # Every full draw (first render, window resize) renders the static
+        # artists only; keep those pixels and put the overlays back on top.
+        if self.ax is None or self.saving:
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_overlays()
+
+    def _draw_overlays(self):
+        for artist in self.overlays:
+            self.figure.draw_artist(artist)
+        self.figure.draw_artist(self.ax.title)
+        self.figure.draw_artist(self.status)
+
+    def blit(self):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_overlays()
+        self.canvas.blit(self.figure.bbox)
+
+    def save(self, path, **kwargs):
+        # For files rather than the screen: a normal draw skips animated
+        # artists, so the overlays and title are drawn as ordinary ones for
+        # once. The frame is only valid at the figure's own dpi.
+        artists = [*self.overlays, self.ax.title]
+        for artist in artists:
+            artist.set_animated(False)
+        self.saving = True
+        try:
+            self.figure.savefig(path, dpi=self.figure.dpi, **kwargs)
+        finally:
+            self.saving = False
+            for artist in artists:
+                artist.set_animated(True)
+
+    def set_title(self, title):
+        self.ax.set_title(title)
+        self.blit()
+
+    def clear_overlays(self):
+        for artist in self.overlays:
+            artist.set_visible(False)
+        self.overlays = []
+        self.ax.set_title(DEFAULT_TITLE)
+
+    def _show_overlay(self, artist):
+        artist.set_visible(True)
+        if artist not in self.overlays:
+            self.overlays.append(artist)
+
+    def show_marker(self, lon, lat, color):
+        # One marker per axes, moved and recoloured for every click.
+        if self.marker is None:
+            (self.marker,) = self.ax.plot(
+                lon,
+                lat,
+                marker="o",
+                markersize=8,
+                transform=ccrs.PlateCarree(),
+                animated=True,
+            )
+        self.marker.set_data([lon], [lat])
+        self.marker.set_color(color)
+        self._show_overlay(self.marker)
+
+    def show_item(self, item, geometry, style):
+        patches, lines = self._item_overlay(item, geometry)
+        rectangle_style, line_style = HIGHLIGHT_STYLES[style]
+        patches.set(**rectangle_style)
+        lines.set(**line_style)
+        self._show_overlay(patches)
+        self._show_overlay(lines)
+
+    def _item_overlay(self, item, geometry):
+        # Built once per item for the current axes: every bbox in a single
+        # PathCollection and every line in a single LineCollection, so a
+        # hint or answer only toggles and restyles existing artists.
+        overlay = self.item_overlays.get(item)
+        if overlay is None:
+            patches = PathCollection(
+                self._bbox_paths(geometry.bboxes), zorder=1, transform=self.ax.transData
+            )
+            lines = LineCollection(
+                self.geometry.project_many(geometry.lines, self.projection),
+                capstyle="projecting",
+                joinstyle="round",
+                zorder=2,
+                transform=self.ax.transData,
+            )
+            for artist in (patches, lines):
+                artist.set_animated(True)
+                artist.set_visible(False)
+                self.ax.add_collection(artist, autolim=False)
+            overlay = (patches, lines)
+            self.item_overlays[item] = overlay
+        return overlay
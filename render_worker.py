@@ -0,0 +1,76 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 15
+
+
+class RenderWorker:
+    # Runs render jobs on one background thread and hands the results back
+    # on the Tk thread, which polls with root.after (Tk must not be touched
+    # from other threads). Only the latest job matters: submitting a new
+    # one makes every earlier job obsolete, and obsolete jobs are skipped
+    # if they have not started yet and dropped if they have. A job that
+    # raises is reported to its on_error callback instead.
+    def __init__(self, root, poll_interval=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.pending = None
+        self.polling = False
+
+    def submit(self, render, callback, on_error=None):
+        self.cancel()
+        generation = self.generation
+        future = self.executor.submit(self._run, generation, render)
+        self.pending = (generation, future, callback, on_error)
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _run(self, generation, render):
+        if generation != self.generation:
+            return None
+        return render()
+
+    def adopt(self, callback, on_error=None):
+        # Deliver the running job's result to a different callback, e.g.
+        # when a prefetched frame turns out to be needed right now.
+        generation, future, _, _ = self.pending
+        self.pending = (generation, future, callback, on_error)
+
+    def cancel(self):
+        self.generation += 1
+        if self.pending is not None:
+            self.pending[1].cancel()
+            self.pending = None
+
+    @property
+    def busy(self):
+        return self.pending is not None
+
+    def _poll(self):
+        if self.pending is None:
+            self.polling = False
+            return
+        generation, future, callback, on_error = self.pending
+        if not future.done():
+            self.root.after(self.poll_interval, self._poll)
+            return
+        self.polling = False
+        self.pending = None
+        if generation != self.generation:
+            return
+        try:
+            result = future.result()
+        except Exception as error:
+            if on_error is None:
+                raise
+            traceback.print_exception(error)
+            on_error(error)
+            return
+        callback(result)
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
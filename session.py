@@ -0,0 +1,96 @@
+import random
+from collections import namedtuple
+
+CORRECT_POINTS = 1
+WRONG_PENALTY = 1
+HINT_COST = 1
+
+# What a session tells its listener. Answered carries the asked item's
+# outline (its hint geometry) when the answer was wrong, None otherwise.
+RoundStarted = namedtuple("RoundStarted", ["round", "item"])
+OutOfItems = namedtuple("OutOfItems", ["round"])
+HintShown = namedtuple("HintShown", ["item", "geometry"])
+Answered = namedtuple(
+    "Answered", ["lon", "lat", "item", "asked_item", "correct", "geometry"]
+)
+ScoreChanged = namedtuple("ScoreChanged", ["score", "delta"])
+
+
+class Session:
+    # One player's game in one mode: the questions, the score and the round
+    # lifecycle, with no UI. Everything that happens is reported to the
+    # listener as an event (the Tk GUI draws and updates its labels from
+    # them). The loaded modes are shared through a GameLogic, so any number
+    # of sessions can run side by side.
+    #
+    # A round is open from next_round until it is answered correctly; wrong
+    # answers and hints cost a point each and leave it open. The next
+    # round's question is picked when a round starts, so whatever it needs
+    # can be prepared while the current one is played.
+    def __init__(self, logic, mode, listener=None, rng=random):
+        logic.load_mode(mode)
+        self.logic = logic
+        self.mode = mode
+        self.entry = logic.modes[mode]
+        self.pool = self.entry.question_pool()
+        self.listener = listener
+        self.rng = rng
+        self.score = 0
+        self.round = 0
+        self.asked_item = None
+        self.next_item = None
+        self.open = False
+
+    def _emit(self, event):
+        if self.listener is not None:
+            self.listener(event)
+        return event
+
+    def _add_score(self, delta):
+        self.score += delta
+        self._emit(ScoreChanged(self.score, delta))
+
+    def start(self):
+        self.round = 0
+        self.next_item = None
+        self._add_score(-self.score)
+        return self.next_round()
+
+    def next_round(self):
+        if not self.pool:
+            self.asked_item = None
+            self.open = False
+            return self._emit(OutOfItems(self.round))
+        self.round += 1
+        self.asked_item = (
+            self.next_item if self.next_item is not None else self.rng.choice(self.pool)
+        )
+        self.next_item = self.rng.choice(self.pool)
+        self.open = True
+        return self._emit(RoundStarted(self.round, self.asked_item))
+
+    def click(self, lon, lat):
+        # Clicks that hit nothing, or come after the round was won, do not
+        # count.
+        if not self.open:
+            return None
+        item = self.logic.item_at(self.mode, lon, lat)
+        if item is None:
+            return None
+        correct = item == self.asked_item
+        geometry = None if correct else self.entry.hint_geometry(self.asked_item)
+        event = self._emit(Answered(lon, lat, item, self.asked_item, correct, geometry))
+        self._add_score(CORRECT_POINTS if correct else -WRONG_PENALTY)
+        if correct:
+            self.open = False
+        return event
+
+    def hint(self):
+        if self.asked_item is None:
+            return None
+        geometry = self.entry.hint_geometry(self.asked_item)
+        if not (geometry.bboxes or geometry.lines):
+            return None
+        event = self._emit(HintShown(self.asked_item, geometry))
+        self._add_score(-HINT_COST)
+        return event
@@ -0,0 +1,99 @@
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+POLL_INTERVAL_MS = 30
+
+# game.py imports this module first, so this is about as early as Python
+# code can observe the start of the process.
+IMPORTED_AT = time.perf_counter()
+
+
+class StartupProfile:
+    # Wall-clock marks for --profile-startup, measured from the moment this
+    # module was imported.
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = IMPORTED_AT
+        self.marks = []
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter()))
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("startup stages:")
+        previous = self.start
+        for stage, moment in self.marks:
+            print(
+                f"  {stage:<42}{(moment - previous) * 1000:9.1f} ms"
+                f"{(moment - self.start) * 1000:11.1f} ms total"
+            )
+            previous = moment
+
+
+def import_time_report(modules):
+    # Runs a fresh interpreter with -X importtime over the deferred imports,
+    # so the numbers are what a cold start pays, not this warm process.
+    code = "".join(f"import {module}\n" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    return result.stderr
+
+
+class BackgroundLoader:
+    # Runs named startup stages one after another on a background thread,
+    # so the Tk window is on screen and responsive while heavy modules are
+    # imported and data is loaded. Progress and the final results come back
+    # to the Tk thread through a queue polled with root.after. Stages must
+    # not touch Tk; each gets the results of the stages before it.
+    def __init__(self, root, stages, on_progress, on_done, on_error, profile):
+        self.root = root
+        self.stages = stages
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.profile = profile
+        self.messages = queue.Queue()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _run(self):
+        results = {}
+        for index, (name, label, stage) in enumerate(self.stages):
+            self.messages.put(("progress", (index, label)))
+            try:
+                results[name] = stage(results)
+            except Exception as error:
+                traceback.print_exc()
+                self.messages.put(("error", error))
+                return
+            self.profile.mark(label)
+        self.messages.put(("done", results))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, value = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.on_progress(*value)
+            elif kind == "error":
+                self.on_error(value)
+                return
+            else:
+                self.on_done(value)
+                return
+        self.root.after(POLL_INTERVAL_MS, self._poll)
@@ -0,0 +1,75 @@
+import numpy as np
+
+from basemap_cache import BasemapCache
+
+
+def frame(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_get_returns_what_was_put():
+    cache = BasemapCache(1000)
+    first = frame(100)
+    cache.put("a", first)
+    assert cache.get("a") is first
+    assert cache.get("b") is None
+
+
+def test_evicts_least_recently_used():
+    cache = BasemapCache(300)
+    for key in "abc":
+        cache.put(key, frame(100))
+    # Using "a" makes "b" the oldest.
+    cache.get("a")
+    cache.put("d", frame(100))
+    assert list(cache.frames) == ["c", "a", "d"]
+    assert cache.nbytes == 300
+    cache.put("e", frame(250))
+    assert list(cache.frames) == ["e"]
+    assert cache.nbytes == 250
+
+
+def test_replacing_a_frame_keeps_the_byte_count():
+    cache = BasemapCache(300)
+    cache.put("a", frame(100))
+    cache.put("a", frame(200))
+    assert cache.nbytes == 200
+    assert len(cache.frames) == 1
+
+
+def test_frame_over_budget_is_not_stored():
+    cache = BasemapCache(300)
+    cache.put("a", frame(100))
+    cache.put("b", frame(301))
+    assert "b" not in cache
+    assert list(cache.frames) == ["a"]
+    # Nor does it leave an older frame under the same key behind.
+    cache.put("a", frame(400))
+    assert "a" not in cache
+    assert cache.nbytes == 0
+
+
+def test_stats():
+    cache = BasemapCache(300)
+    cache.put("a", frame(100))
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "entries": 1,
+        "bytes": 100,
+        "max_bytes": 300,
+    }
+
+
+def test_contains_does_not_count_or_reorder():
+    cache = BasemapCache(200)
+    cache.put("a", frame(100))
+    cache.put("b", frame(100))
+    assert "a" in cache
+    assert "c" not in cache
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.put("c", frame(100))
+    assert list(cache.frames) == ["b", "c"]
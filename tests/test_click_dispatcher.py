@@ -0,0 +1,65 @@
+import pytest
+
+from click_dispatcher import ClickDispatcher
+
+
+@pytest.fixture
+def scheduled():
+    return []
+
+
+@pytest.fixture
+def dispatcher(scheduled):
+    return ClickDispatcher(scheduled.append)
+
+
+def run(scheduled):
+    while scheduled:
+        scheduled.pop(0)()
+
+
+def test_burst_is_one_dispatch_of_the_latest_click(dispatcher, scheduled):
+    ax = object()
+    clicks = []
+    dispatcher.route(ax, lambda lon, lat: clicks.append((lon, lat)))
+    for lon in range(5):
+        dispatcher.push(ax, float(lon), 1.0)
+    assert len(scheduled) == 1
+    assert clicks == []
+    run(scheduled)
+    assert clicks == [(4.0, 1.0)]
+    assert (dispatcher.dispatched, dispatcher.coalesced) == (1, 4)
+
+
+def test_next_burst_is_dispatched_again(dispatcher, scheduled):
+    ax = object()
+    clicks = []
+    dispatcher.route(ax, lambda lon, lat: clicks.append((lon, lat)))
+    dispatcher.push(ax, 1.0, 1.0)
+    run(scheduled)
+    dispatcher.push(ax, 2.0, 2.0)
+    run(scheduled)
+    assert clicks == [(1.0, 1.0), (2.0, 2.0)]
+
+
+def test_route_drops_clicks_on_the_old_map(dispatcher, scheduled):
+    old_ax, new_ax = object(), object()
+    old_clicks = []
+    new_clicks = []
+    dispatcher.route(old_ax, lambda lon, lat: old_clicks.append((lon, lat)))
+    dispatcher.push(old_ax, 1.0, 1.0)
+    dispatcher.route(new_ax, lambda lon, lat: new_clicks.append((lon, lat)))
+    # A click that was already on its way from the old axes.
+    dispatcher.push(old_ax, 2.0, 2.0)
+    run(scheduled)
+    assert old_clicks == [] and new_clicks == []
+    assert dispatcher.dispatched == 0
+
+    dispatcher.push(new_ax, 3.0, 3.0)
+    run(scheduled)
+    assert new_clicks == [(3.0, 3.0)]
+
+
+def test_clicks_before_any_route_are_ignored(dispatcher, scheduled):
+    dispatcher.push(object(), 1.0, 1.0)
+    assert scheduled == []
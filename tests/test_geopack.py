@@ -0,0 +1,83 @@
+import pytest
+
+import data
+import geopack
+from geopack import GeoPack, compile_pack, load_data
+
+
+@pytest.fixture(scope="module")
+def pack_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("pack") / "geo.pack")
+    compile_pack(path)
+    return path
+
+
+def subunits(row):
+    return [(tuple(subunit.bbox), subunit.adm0_a3) for subunit in row]
+
+
+def normalized(data_type, items):
+    # The pack hands out its own Subunit tuples and plain lists/tuples of
+    # floats; compare by value.
+    if data_type == "landen":
+        return {name: subunits(item["bbox"]) for name, item in items.items()}
+    if data_type == "countries_iso":
+        return {
+            name: (item["iso_code"], subunits(item["bbox"]))
+            for name, item in items.items()
+        }
+    if data_type == "rivieren":
+        return {
+            name: [tuple(vertex) for vertex in item["coordinates"]]
+            for name, item in items.items()
+        }
+    if data_type in geopack.BBOX_TYPES:
+        return {name: list(item["bbox"]) for name, item in items.items()}
+    if data_type in geopack.REGION_TYPES:
+        return {name: list(members) for name, members in items.items()}
+    return items
+
+
+@pytest.mark.parametrize("data_type", data.Data.types())
+def test_round_trip(pack_path, data_type):
+    packed = GeoPack(pack_path).registry().get(data_type)
+    source = data.Data.get(data_type)
+    assert list(packed) == list(source)
+    assert normalized(data_type, packed) == normalized(data_type, source)
+
+
+def test_fresh_pack_is_current(pack_path):
+    assert GeoPack(pack_path).is_current()
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / "geo.pack"
+    path.write_bytes(b"not a pack")
+    with pytest.raises(ValueError):
+        GeoPack(str(path))
+
+
+def test_truncated_pack(tmp_path):
+    path = tmp_path / "geo.pack"
+    path.write_bytes(geopack.PACK_MAGIC + b"\x01\x00")
+    with pytest.raises(ValueError):
+        GeoPack(str(path))
+    assert list(load_data(str(path)).get("oceanen")) == list(data.Data.get("oceanen"))
+
+
+def test_load_data_recompiles_stale_pack(tmp_path, monkeypatch):
+    path = str(tmp_path / "geo.pack")
+    compile_pack(path)
+    digests = geopack.source_digests()
+    monkeypatch.setattr(
+        geopack, "source_digests", lambda: {**digests, "data": "changed"}
+    )
+    assert not GeoPack(path).is_current()
+    registry = load_data(path)
+    assert GeoPack(path).digests["data"] == "changed"
+    assert list(registry.get("oceanen")) == list(data.Data.get("oceanen"))
+
+
+def test_load_data_compiles_missing_pack(tmp_path):
+    path = str(tmp_path / "geo.pack")
+    assert list(load_data(path).get("cities")) == list(data.Data.get("cities"))
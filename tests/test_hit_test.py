@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from shapely.geometry import Point
+
+import geodata
+from game_logic import GameLogic
+from geopack import load_data
+
+MODES = ["countries", "rivers", "oceans", "mountains", "continents", "world_blocks"]
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_data()
+
+
+@pytest.fixture
+def fake_borders(data, monkeypatch):
+    # Stand-in for the Natural Earth polygons, so exact mode needs no
+    # download: a disc in the middle of every subunit bbox.
+    geometries = {}
+    for country in data.get("landen").values():
+        for subunit in country["bbox"]:
+            min_lon, min_lat, max_lon, max_lat = subunit.bbox
+            radius = 0.4 * min(max_lon - min_lon, max_lat - min_lat)
+            disc = Point((min_lon + max_lon) / 2, (min_lat + max_lat) / 2).buffer(
+                radius
+            )
+            geometries.setdefault(subunit.adm0_a3, []).append(disc)
+    monkeypatch.setattr(
+        geodata, "_natural_earth_countries", lambda resolution: geometries
+    )
+
+
+def sample_points(count=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    lons = rng.uniform(-180, 180, count)
+    lats = rng.uniform(-90, 90, count)
+    # Clicks outside a projection's domain come in as NaN or inf.
+    lons[:3] = [np.nan, np.inf, 10.0]
+    lats[:3] = [10.0, 10.0, -np.inf]
+    return lons, lats
+
+
+def assert_batch_matches_single(logic, mode):
+    logic.set_game_mode(mode)
+    lons, lats = sample_points()
+    single = [logic.get_item_from_coordinates(lon, lat) for lon, lat in zip(lons, lats)]
+    batch = logic.get_items_from_coordinates(lons, lats)
+    assert list(batch) == single
+    assert single[:3] == [None, None, None]
+    assert any(item is not None for item in single)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_batch_matches_single(data, mode):
+    assert_batch_matches_single(GameLogic(data), mode)
+
+
+@pytest.mark.parametrize("mode", ["countries", "continents", "world_blocks"])
+def test_batch_matches_single_exact(data, fake_borders, mode):
+    assert_batch_matches_single(GameLogic(data, exact_countries=True), mode)
+
+
+def test_batch_keeps_shape(data):
+    logic = GameLogic(data)
+    logic.set_game_mode("oceans")
+    lons, lats = np.meshgrid(np.linspace(-170, 170, 7), np.linspace(-80, 80, 5))
+    items = logic.get_items_from_coordinates(lons, lats)
+    assert items.shape == (5, 7)
+    assert items[2, 3] == logic.get_item_from_coordinates(lons[2, 3], lats[2, 3])
+
+
+def test_no_mode_hits_nothing(data):
+    items = GameLogic(data).get_items_from_coordinates([0.0, 10.0], [0.0, 10.0])
+    assert list(items) == [None, None]
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+import disk_cache
+from game_logic import GameLogic
+from geopack import load_data
+from label_raster import NO_LABEL, LabelRaster
+
+RESOLUTION = 5
+
+
+@pytest.fixture(scope="module")
+def logic():
+    return GameLogic(load_data())
+
+
+@pytest.fixture
+def small():
+    # 2 x 4 cells of 90 degrees: "a" and "b" in the top row, nothing in the
+    # bottom-left cell.
+    labels = np.array([[NO_LABEL, 0, 0, 1], [0, 1, 1, 0]], dtype=np.uint16)
+    return LabelRaster(labels, ["a", "b"], 90)
+
+
+def cell_centres(resolution):
+    lats = -90 + (np.arange(int(180 / resolution)) + 0.5) * resolution
+    lons = -180 + (np.arange(int(360 / resolution)) + 0.5) * resolution
+    lons, lats = np.meshgrid(lons, lats)
+    return lons.ravel(), lats.ravel()
+
+
+@pytest.mark.parametrize("mode", ["countries", "oceans", "continents"])
+def test_matches_hit_test_at_cell_centres(logic, mode):
+    entry = logic.modes[mode]
+    entry.load()
+    raster = LabelRaster.build(entry.hit_test_many, entry.items(), RESOLUTION)
+    lons, lats = cell_centres(RESOLUTION)
+    expected = [entry.hit_test(lon, lat) for lon, lat in zip(lons, lats)]
+    assert [raster.lookup(lon, lat) for lon, lat in zip(lons, lats)] == expected
+    assert list(raster.lookup_many(lons, lats)) == expected
+    assert None in expected
+
+
+def test_empty_cells(small):
+    assert small.lookup(-135, -45) is None
+    assert small.lookup(-45, -45) == "a"
+    assert list(small.lookup_many([-135, 135], [-45, -45])) == [None, "b"]
+
+
+def test_edges_are_clamped(small):
+    assert small.lookup(180, 90) == "a"
+    assert small.lookup(-180, -90) is None
+    assert small.lookup(190, -95) == "b"
+    assert list(small.lookup_many([180, -180, 190], [90, -90, -95])) == [
+        "a",
+        None,
+        "b",
+    ]
+
+
+def test_non_finite(small):
+    for lon, lat in [(np.nan, 0), (0, np.nan), (np.inf, 0), (0, -np.inf)]:
+        assert small.lookup(lon, lat) is None
+    lons = [np.nan, 0, np.inf, 45]
+    lats = [0, -np.inf, 0, 45]
+    assert list(small.lookup_many(lons, lats)) == [None, None, None, "b"]
+
+
+def test_cache_follows_key_and_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def hit_test_many(lons, lats):
+        calls.append(len(lons))
+        return ["a" if lon < 0 else "b" for lon in lons]
+
+    def files():
+        return sorted(os.listdir(tmp_path / "labels"))
+
+    first = LabelRaster.load_or_build("test", ["a", "b"], hit_test_many, key=(1,))
+    cached = files()
+    assert len(cached) == 1
+    built = len(calls)
+
+    again = LabelRaster.load_or_build("test", ["a", "b"], hit_test_many, key=(1,))
+    assert len(calls) == built
+    assert files() == cached
+    np.testing.assert_array_equal(again.labels, first.labels)
+
+    old = files()
+    LabelRaster.load_or_build("test", ["a", "b"], hit_test_many, key=(2,))
+    assert len(files()) == 1 and files() != old
+
+    old = files()
+    LabelRaster.load_or_build("test", ["a", "b", "c"], hit_test_many, key=(2,))
+    assert len(files()) == 1 and files() != old
+    assert len(calls) == 3 * built
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from render_worker import RenderWorker
+
+
+class FakeRoot:
+    # Runs root.after callbacks by hand, in order.
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+
+@pytest.fixture
+def worker():
+    worker = RenderWorker(FakeRoot())
+    yield worker
+    worker.shutdown()
+
+
+def test_result_reaches_callback(worker):
+    results = []
+    worker.submit(lambda: 42, results.append)
+    assert worker.busy
+    worker.root.run()
+    assert results == [42]
+    assert not worker.busy
+
+
+def test_failure_reaches_on_error(worker):
+    results = []
+    errors = []
+
+    def render():
+        raise OSError("no shapefiles")
+
+    worker.submit(render, results.append, errors.append)
+    worker.root.run()
+    assert results == []
+    assert [str(error) for error in errors] == ["no shapefiles"]
+    assert not worker.busy and not worker.polling
+
+
+def test_only_the_latest_job_is_delivered(worker):
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait()
+        return "old"
+
+    worker.submit(slow, results.append)
+    started.wait()
+    worker.submit(lambda: "new", results.append)
+    release.set()
+    worker.root.run()
+    assert results == ["new"]
+
+
+def test_adopt(worker):
+    release = threading.Event()
+    first = []
+    second = []
+    worker.submit(lambda: release.wait() and "frame", first.append)
+    worker.adopt(second.append)
+    release.set()
+    worker.root.run()
+    assert (first, second) == ([], ["frame"])
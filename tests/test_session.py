@@ -0,0 +1,143 @@
+import math
+import random
+
+import pytest
+
+from game_logic import GameLogic
+from geopack import load_data
+from session import (
+    CORRECT_POINTS,
+    HINT_COST,
+    WRONG_PENALTY,
+    Answered,
+    HintShown,
+    OutOfItems,
+    RoundStarted,
+    ScoreChanged,
+    Session,
+)
+
+
+@pytest.fixture(scope="module")
+def logic():
+    return GameLogic(load_data())
+
+
+def centre(geometry):
+    min_lon, min_lat, max_lon, max_lat = geometry.bboxes[0]
+    return (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+
+
+@pytest.fixture
+def session(logic):
+    # Oceans, asking only the items whose bbox centre hits the item itself,
+    # so every question has a known right answer.
+    events = []
+    session = Session(logic, "oceans", events.append, random.Random(0))
+    answers = {}
+    for item in session.pool:
+        point = centre(session.entry.hint_geometry(item))
+        if logic.item_at("oceans", *point) == item:
+            answers[item] = point
+    assert len(answers) >= 2
+    session.pool = list(answers)
+    session.events = events
+    session.answers = answers
+    return session
+
+
+def wrong_answer(session):
+    return next(
+        point for item, point in session.answers.items() if item != session.asked_item
+    )
+
+
+def test_start(session):
+    event = session.start()
+    assert isinstance(event, RoundStarted)
+    assert event == RoundStarted(1, session.asked_item)
+    assert session.asked_item in session.pool
+    assert session.events == [ScoreChanged(0, 0), event]
+
+
+def test_correct_answer_closes_the_round(session):
+    session.start()
+    event = session.click(*session.answers[session.asked_item])
+    assert event.correct
+    assert event.item == event.asked_item == session.asked_item
+    assert event.geometry is None
+    assert session.score == CORRECT_POINTS
+    assert session.events[-1] == ScoreChanged(CORRECT_POINTS, CORRECT_POINTS)
+    # The round is won; further clicks do not count.
+    assert session.click(*session.answers[session.asked_item]) is None
+    assert session.score == CORRECT_POINTS
+
+
+def test_wrong_answer_keeps_the_round_open(session):
+    session.start()
+    event = session.click(*wrong_answer(session))
+    assert isinstance(event, Answered)
+    assert not event.correct
+    assert event.geometry == session.entry.hint_geometry(session.asked_item)
+    assert session.score == -WRONG_PENALTY
+    assert session.click(*session.answers[session.asked_item]).correct
+    assert session.score == CORRECT_POINTS - WRONG_PENALTY
+
+
+def test_clicks_that_hit_nothing_do_not_count(session):
+    session.start()
+    assert session.click(math.nan, 0.0) is None
+    assert session.click(0.0, math.inf) is None
+    assert session.score == 0
+
+
+def test_hint(session):
+    assert session.hint() is None
+    session.start()
+    event = session.hint()
+    assert event == HintShown(
+        session.asked_item, session.entry.hint_geometry(session.asked_item)
+    )
+    assert session.score == -HINT_COST
+
+
+def test_hint_without_geometry(logic):
+    session = Session(logic, "countries", rng=random.Random(0))
+    session.start()
+    session.asked_item = "Atlantis"
+    assert session.hint() is None
+    assert session.score == 0
+
+
+def test_rounds(session):
+    session.start()
+    for round in range(2, 6):
+        event = session.next_round()
+        assert event == RoundStarted(round, session.asked_item)
+    assert session.round == 5
+    # start begins a new game: round 1, score back to zero.
+    session.click(*wrong_answer(session))
+    session.start()
+    assert session.round == 1
+    assert session.score == 0
+    assert session.events[-2] == ScoreChanged(0, WRONG_PENALTY)
+
+
+def test_out_of_items(session):
+    session.pool = []
+    event = session.start()
+    assert event == OutOfItems(0)
+    assert session.asked_item is None
+    assert session.click(*next(iter(session.answers.values()))) is None
+    assert session.hint() is None
+
+
+def test_sessions_share_the_logic(logic):
+    first = Session(logic, "oceans", rng=random.Random(1))
+    second = Session(logic, "mountains", rng=random.Random(1))
+    first.start()
+    second.start()
+    assert first.asked_item in first.pool
+    assert second.asked_item in second.pool
+    first.hint()
+    assert (first.score, second.score) == (-HINT_COST, 0)
@@ -0,0 +1,363 @@
+import tkinter as tk
+
+import cartopy.crs as ccrs
+import numpy as np
+from matplotlib.colors import to_hex
+from matplotlib.path import Path
+
+from feature_cache import FEATURES, FeatureCache
+from geometry_store import GeometryStore
+
+DEFAULT_TITLE = "Geografie Spel"
+RENDERING_TEXT = "rendering…"
+FAILED_TEXT = "The map could not be drawn:\n{error}"
+TITLE_FONT = ("Arial", 14)
+
+# Canvas pixels kept free above the map for the title, and around it.
+TITLE_HEIGHT = 30
+MARGIN = 10
+
+MARKER_RADIUS = 4
+
+OCEAN_COLOR = to_hex(FEATURES["ocean"][0].kwargs["facecolor"])
+# Land is flat-coloured in both modes; in easy mode a greener tint stands in
+# for the etopo relief MapRenderer draws.
+LAND_COLORS = {
+    False: "#c5d6a0",
+    True: to_hex(FEATURES["land"][0].kwargs["facecolor"]),
+}
+
+# Natural Earth layers in drawing order, with their canvas item options.
+# Polygon layers are filled, the rest are polylines.
+POLYGON_LAYERS = {"land", "lakes"}
+LAYER_STYLES = {
+    "land": dict(outline=""),
+    "lakes": dict(fill=OCEAN_COLOR, outline=""),
+    "coastline": dict(fill="black", width=1),
+    "borders": dict(fill="black", width=1, dash=(1, 3)),
+    "rivers": dict(fill=to_hex(FEATURES["rivers"][0].kwargs["edgecolor"]), width=1),
+}
+
+# (bbox style, line style) for an item's highlight. Tk has no alpha, so the
+# hint is stippled instead.
+HIGHLIGHT_STYLES = {
+    "hint": (
+        dict(fill="yellow", outline="yellow", width=1, stipple="gray50"),
+        dict(fill="yellow", width=10, stipple="gray50"),
+    ),
+    "answer": (
+        dict(fill="", outline="green", width=2, stipple=""),
+        dict(fill="green", width=2, stipple=""),
+    ),
+}
+
+
+class CanvasView:
+    # Where the current projection's map sits on the canvas: one scale and
+    # offset from projected coordinates to canvas pixels (y pointing down),
+    # fitted so the whole map is visible at its own aspect ratio.
+    def __init__(self, projection):
+        self.projection = projection
+        self.scale = 1.0
+        self.x0 = 0.0
+        self.y0 = 0.0
+
+    def fit(self, width, height):
+        x_min, x_max = self.projection.x_limits
+        y_min, y_max = self.projection.y_limits
+        map_width = max(width - 2 * MARGIN, 1)
+        map_height = max(height - TITLE_HEIGHT - MARGIN, 1)
+        self.scale = min(map_width / (x_max - x_min), map_height / (y_max - y_min))
+        self.x0 = (width - (x_max - x_min) * self.scale) / 2 - x_min * self.scale
+        self.y0 = (
+            TITLE_HEIGHT
+            + (map_height - (y_max - y_min) * self.scale) / 2
+            + y_max * self.scale
+        )
+
+    def to_canvas(self, points):
+        # Flat [x0, y0, x1, y1, ...], the way Tk takes coordinates.
+        pixels = np.empty((len(points), 2))
+        pixels[:, 0] = self.x0 + points[:, 0] * self.scale
+        pixels[:, 1] = self.y0 - points[:, 1] * self.scale
+        return pixels.ravel().tolist()
+
+    def to_lonlat(self, x, y):
+        map_x = (x - self.x0) / self.scale
+        map_y = (self.y0 - y) / self.scale
+        x_min, x_max = self.projection.x_limits
+        y_min, y_max = self.projection.y_limits
+        if not (x_min <= map_x <= x_max and y_min <= map_y <= y_max):
+            return None
+        lon, lat = ccrs.PlateCarree().transform_point(map_x, map_y, self.projection)
+        if not (np.isfinite(lon) and np.isfinite(lat)):
+            return None
+        return lon, lat
+
+
+class TkCanvasRenderer:
+    # A lighter alternative to MapRenderer for low-end machines: no
+    # matplotlib figure and no raster basemap. The Natural Earth layers,
+    # the game rivers and the overlays are native tk.Canvas polygons and
+    # polylines, made from the projected coordinates FeatureCache and
+    # GeometryStore keep, scaled to the canvas. Tk repaints changed items
+    # by itself, so there is nothing to blit. With a RenderWorker, layers
+    # that still have to be projected are projected off the Tk thread.
+    def __init__(self, master, worker=None):
+        self.canvas = tk.Canvas(master, background="white", highlightthickness=0)
+        self.worker = worker
+        self.features = FeatureCache()
+        self.geometry = GeometryStore()
+        self.rings = {}
+        self.ax = None
+        self.projection = None
+        self.hard_mode = False
+        self.rivers = {}
+        self.title = DEFAULT_TITLE
+        self.title_item = None
+        self.marker = None
+        self.marker_item = None
+        self.shown = {}
+        self.item_overlays = {}
+        self.prefetching = None
+        self.failure = None
+        self.size = None
+        self.canvas.bind("<Configure>", self._on_resize)
+
+    def set_projection(self, projection, hard_mode, rivers):
+        self.projection = projection
+        self.hard_mode = hard_mode
+        self.rivers = rivers or {}
+        self.ax = CanvasView(projection)
+        self.title = DEFAULT_TITLE
+        self.marker = None
+        self.shown = {}
+        self.failure = None
+        if self.worker is not None and not self._layers_ready(projection):
+            # Keep the event loop running; the map is drawn when the worker
+            # has projected its layers, unless it has moved on by then.
+            def loaded(_):
+                self.prefetching = None
+                if projection is self.projection:
+                    self._redraw()
+
+            def failed(error):
+                self.prefetching = None
+                if projection is self.projection:
+                    self.failure = error
+                    self._redraw()
+
+            if self.prefetching is projection and self.worker.busy:
+                self.worker.adopt(loaded, failed)
+            else:
+                self.worker.submit(
+                    lambda: self._load_layers(projection), loaded, failed
+                )
+            self.prefetching = None
+        self._redraw()
+
+    def prefetch(self, projection, hard_mode):
+        # Project the layers of a map that will probably be needed next,
+        # without touching what is on screen or interrupting other work.
+        if self.worker is None or self.worker.busy or self._layers_ready(projection):
+            return
+        self.prefetching = projection
+        self.worker.submit(
+            lambda: self._load_layers(projection),
+            self._prefetched,
+            self._prefetched,
+        )
+
+    def _prefetched(self, _):
+        # Also on failure: set_projection loads the layers again and reports
+        # the error then.
+        self.prefetching = None
+
+    @property
+    def rendering(self):
+        return self.worker is not None and self.worker.busy
+
+    def _layers_ready(self, projection):
+        return all((name, projection) in self.rings for name in LAYER_STYLES)
+
+    def _load_layers(self, projection):
+        for name in LAYER_STYLES:
+            self._layer(name, projection)
+
+    def _layer(self, name, projection):
+        key = (name, projection)
+        rings = self.rings.get(key)
+        if rings is None:
+            rings = [
+                ring
+                for path in self.features.get_paths(name, projection)
+                for ring in _path_rings(path)
+            ]
+            if name in POLYGON_LAYERS:
+                rings = [ring for ring in rings if len(ring) > 2]
+            self.rings[key] = rings
+        return rings
+
+    def _on_resize(self, event):
+        if self.ax is not None and (event.width, event.height) != self.size:
+            self._redraw()
+
+    def _redraw(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        self.canvas.delete("all")
+        self.title_item = None
+        self.marker_item = None
+        self.item_overlays = {}
+        self.size = (width, height)
+        if width <= 1 or height <= 1:
+            # Not laid out yet; <Configure> redraws once it is.
+            return
+        self.ax.fit(width, height)
+        if self.worker is not None and not self._layers_ready(self.projection):
+            text = (
+                RENDERING_TEXT
+                if self.failure is None
+                else FAILED_TEXT.format(error=self.failure)
+            )
+            self.canvas.create_text(width / 2, height / 2, text=text)
+        else:
+            self._draw_basemap()
+        self.title_item = self.canvas.create_text(
+            width / 2, TITLE_HEIGHT / 2, text=self.title, font=TITLE_FONT
+        )
+        self.marker_item = self.canvas.create_oval(
+            0, 0, 0, 0, width=0, state=tk.HIDDEN, tags="overlay"
+        )
+        for item, (geometry, style) in self.shown.items():
+            self.show_item(item, geometry, style)
+        if self.marker is not None:
+            self.show_marker(*self.marker)
+
+    def _draw_basemap(self):
+        view = self.ax
+        boundary = view.to_canvas(np.asarray(self.projection.boundary.coords))
+        self.canvas.create_polygon(boundary, fill=OCEAN_COLOR, outline="")
+        for name, style in LAYER_STYLES.items():
+            if name == "land":
+                style = dict(style, fill=LAND_COLORS[self.hard_mode])
+            create = (
+                self.canvas.create_polygon
+                if name in POLYGON_LAYERS
+                else self.canvas.create_line
+            )
+            for ring in self._layer(name, self.projection):
+                create(view.to_canvas(ring), **style)
+
+        for segment in self.geometry.project_many(
+            (data["coordinates"] for data in self.rivers.values()), self.projection
+        ):
+            self.canvas.create_line(
+                view.to_canvas(segment),
+                fill="blue",
+                width=2,
+                capstyle=tk.PROJECTING,
+                joinstyle=tk.ROUND,
+            )
+        self.canvas.create_polygon(boundary, fill="", outline="black")
+
+    def blit(self):
+        pass
+
+    def set_title(self, title):
+        self.title = title
+        if self.title_item is not None:
+            self.canvas.itemconfigure(self.title_item, text=title)
+
+    def clear_overlays(self):
+        self.canvas.itemconfigure("overlay", state=tk.HIDDEN)
+        self.shown = {}
+        self.marker = None
+        self.set_title(DEFAULT_TITLE)
+
+    def show_marker(self, lon, lat, color):
+        self.marker = (lon, lat, color)
+        if self.marker_item is None:
+            return
+        x, y = self.ax.to_canvas(
+            np.array([self.projection.transform_point(lon, lat, ccrs.PlateCarree())])
+        )
+        self.canvas.coords(
+            self.marker_item,
+            x - MARKER_RADIUS,
+            y - MARKER_RADIUS,
+            x + MARKER_RADIUS,
+            y + MARKER_RADIUS,
+        )
+        self.canvas.itemconfigure(self.marker_item, fill=color, state=tk.NORMAL)
+        self.canvas.tag_raise(self.marker_item)
+
+    def show_item(self, item, geometry, style):
+        self.shown[item] = (geometry, style)
+        if self.title_item is None:
+            return
+        boxes, lines = self._item_overlay(item, geometry)
+        box_style, line_style = HIGHLIGHT_STYLES[style]
+        for canvas_item in boxes:
+            self.canvas.itemconfigure(canvas_item, state=tk.NORMAL, **box_style)
+        for canvas_item in lines:
+            self.canvas.itemconfigure(canvas_item, state=tk.NORMAL, **line_style)
+        self.canvas.tag_raise(self.marker_item)
+        self.canvas.tag_raise(self.title_item)
+
+    def _item_overlay(self, item, geometry):
+        # Created once per item for the current drawing, hidden; a hint or
+        # answer only shows and restyles existing canvas items.
+        overlay = self.item_overlays.get(item)
+        if overlay is None:
+            boxes = [
+                self.canvas.create_polygon(
+                    self.ax.to_canvas(segment), state=tk.HIDDEN, tags="overlay"
+                )
+                for bbox in geometry.bboxes
+                for segment in self.geometry.project_bbox(bbox, self.projection)
+                if len(segment) > 2
+            ]
+            lines = [
+                self.canvas.create_line(
+                    self.ax.to_canvas(segment),
+                    capstyle=tk.PROJECTING,
+                    joinstyle=tk.ROUND,
+                    state=tk.HIDDEN,
+                    tags="overlay",
+                )
+                for segment in self.geometry.project_many(
+                    geometry.lines, self.projection
+                )
+            ]
+            overlay = (boxes, lines)
+            self.item_overlays[item] = overlay
+        return overlay
+
+    def connect_clicks(self, on_click):
+        # Reports every click on the map as on_click(ax, lon, lat).
+        def on_press(event):
+            if self.ax is None:
+                return
+            lonlat = self.ax.to_lonlat(event.x, event.y)
+            if lonlat is not None:
+                on_click(self.ax, *lonlat)
+
+        return self.canvas.bind("<Button-1>", on_press)
+
+
+def _path_rings(path):
+    # The separate polylines of a matplotlib path, with closed ones closed
+    # explicitly (the vertex under a CLOSEPOLY code is meaningless).
+    vertices = path.vertices
+    if path.codes is None:
+        return [vertices]
+    starts = np.flatnonzero(path.codes == Path.MOVETO)
+    rings = []
+    for start, end in zip(starts, [*starts[1:], len(vertices)]):
+        ring = vertices[start:end]
+        if path.codes[end - 1] == Path.CLOSEPOLY:
+            ring = np.concatenate([ring[:-1], ring[:1]])
+        if len(ring) > 1:
+            rings.append(ring)
+    return rings